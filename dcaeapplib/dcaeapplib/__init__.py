@@ -19,66 +19,562 @@
 
 import base64
 import json
+import logging
 import os
 import requests
-from threading import Thread
+from requests.adapters import HTTPAdapter
+from collections import deque
+from threading import Condition, Event, Lock, Thread
+import time
 import uuid
 from onap_dcae_cbs_docker_client.client import get_config
+from dcaeapplib.metrics import Registry
 
 try:
   from http.server import BaseHTTPRequestHandler, HTTPServer
+  from socketserver import ThreadingMixIn
 except ImportError:
   from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+  from SocketServer import ThreadingMixIn
 
 _httpport = int(os.environ['DCAEPORT']) if 'DCAEPORT' in os.environ else 80
+# Message Router connection settings, per stream: the number of keep-alive
+# connections, the connect timeout, and how much longer than the long-poll
+# timeout (or, for publishes, how long at all) to wait for a response, in seconds
+_poolsize = int(os.environ['DCAEPOOLSIZE']) if 'DCAEPOOLSIZE' in os.environ else 4
+_conntimeout = float(os.environ['DCAECONNTIMEOUT']) if 'DCAECONNTIMEOUT' in os.environ else 5.0
+_readtimeout = float(os.environ['DCAEREADTIMEOUT']) if 'DCAEREADTIMEOUT' in os.environ else 30.0
+# how many bytes of received records a prefetching consumer buffers, per stream
+_maxunreadbytes = int(os.environ['DCAEMAXUNREADBYTES']) if 'DCAEMAXUNREADBYTES' in os.environ else 16 * 1024 * 1024
+# when set, the number of seconds between background evaluations of the
+# health callback, whose latest result /healthcheck then reports, as long as
+# it is no older than DCAEHEALTHMAXAGE seconds (default 3 intervals)
+_healthinterval = float(os.environ['DCAEHEALTHINTERVAL']) if 'DCAEHEALTHINTERVAL' in os.environ else None
+_healthmaxage = float(os.environ['DCAEHEALTHMAXAGE']) if 'DCAEHEALTHMAXAGE' in os.environ else None
 _clientid = uuid.uuid4().hex
+_logger = logging.getLogger(__name__)
 _groupid = uuid.uuid4().hex
 
+class _server(ThreadingMixIn, HTTPServer):
+  """
+  Serves each request in its own thread, so that a slow request never holds up a health check
+  """
+  daemon_threads = True
+
 class _handler(BaseHTTPRequestHandler):
+  # seconds a client may take to send its request
+  timeout = 10
+
   def do_GET(self):
     if '/healthcheck' == self.path:
-      if self.server.env._health():
-        self.send_response(202)
-        self.end_headers()
-      else:
-        self.send_error(503)
+      healthy, report = self.server.env._healthcheck.report()
+      body = json.dumps(report).encode('utf-8')
+      self.send_response(202 if healthy else 503)
+      self.send_header('Content-Type', 'application/json')
+      self.send_header('Content-Length', str(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
     elif '/reconfigure' == self.path:
-      self.server.env._loadconfig()
-      self.server.env._reconf()
+      self.server.env._reconfigurer.request()
       self.send_response(202)
       self.end_headers()
+    elif '/metrics' == self.path:
+      body = self.server.env.metrics.render().encode('utf-8')
+      self.send_response(200)
+      self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+      self.send_header('Content-Length', str(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
     else:
       self.send_error(404)
 
+class _HealthCheck:
+  """
+  Evaluates the health callback, either for each health check, or every
+  interval seconds on a background thread, whose latest result is then
+  reported as long as it is at most maxage seconds old.  Stopping does not
+  wait for the thread, which may be stuck in the callback; each thread has
+  its own stop event, and drops its result once stopped.
+  """
+  def __init__(self, check, interval, maxage):
+    self._check = check
+    self._interval = interval
+    self._maxage = maxage if maxage is not None else (3 * interval if interval else None)
+    self._result = None
+    self._stopped = None
+    self._thread = None
+
+  def start(self):
+    if self._interval and self._thread is None:
+      self._result = self._evaluate()
+      self._stopped = Event()
+      self._thread = Thread(target=self._run, args=(self._stopped,), name='healthcheck')
+      self._thread.daemon = True
+      self._thread.start()
+
+  def stop(self):
+    if self._thread is not None:
+      self._stopped.set()
+      self._thread = None
+
+  def _evaluate(self):
+    start = time.time()
+    error = None
+    try:
+      healthy = bool(self._check())
+    except Exception as e:
+      healthy = False
+      error = str(e)
+    return (healthy, start, time.time() - start, error)
+
+  def _run(self, stopped):
+    while not stopped.wait(self._interval):
+      result = self._evaluate()
+      if not stopped.is_set():
+        self._result = result
+
+  def report(self):
+    """
+    Return whether the application is healthy, and a JSON-able report of the evaluation
+    """
+    result = self._result if self._thread is not None else None
+    cached = result is not None
+    if not cached:
+      result = self._evaluate()
+    healthy, checked, duration, error = result
+    age = time.time() - checked
+    report = { 'healthy': healthy, 'checked': checked, 'duration_ms': round(duration * 1000.0, 3), 'age_ms': round(age * 1000.0, 3), 'cached': cached }
+    if cached and age > self._maxage:
+      healthy = report['healthy'] = False
+      report['stale'] = True
+    if error is not None:
+      report['error'] = error
+    return healthy, report
+
+class _Reconfigurer:
+  """
+  Reloads the configuration and calls the reconfigure callback on its own
+  thread, once for all the requests received while it was busy.
+  """
+  def __init__(self, env):
+    self._env = env
+    self._cond = Condition()
+    self._pending = False
+    self._running = False
+    self._stopped = False
+    self._thread = Thread(target=self._run, name='reconfigure')
+    self._thread.daemon = True
+    self._thread.start()
+
+  def request(self):
+    with self._cond:
+      self._pending = True
+      self._cond.notify_all()
+
+  def wait(self, timeout = None):
+    """
+    Wait until no reconfiguration is pending or in progress; return whether that is the case
+    """
+    deadline = None if timeout is None else time.time() + timeout
+    with self._cond:
+      while self._pending or self._running:
+        remaining = None if deadline is None else deadline - time.time()
+        if remaining is not None and remaining <= 0:
+          return False
+        self._cond.wait(remaining)
+      return True
+
+  def stop(self):
+    with self._cond:
+      self._stopped = True
+      self._cond.notify_all()
+
+  def _run(self):
+    while True:
+      with self._cond:
+        while not self._pending and not self._stopped:
+          self._cond.wait()
+        if self._stopped:
+          return
+        self._pending = False
+        self._running = True
+      start = time.time()
+      try:
+        self._env._loadconfig()
+        self._env._reconf()
+      except Exception:
+        _logger.exception('Reconfiguration failed')
+      self._env._m_reconfigure().observe(time.time() - start)
+      with self._cond:
+        self._running = False
+        self._cond.notify_all()
+
 def _genauth(sinfo):
   """
-  Return authentication parameters for stream, if present.
+  Return the HTTP basic authentication header for stream, if credentials are present.
   """
   user = sinfo['aaf_username'] if 'aaf_username' in sinfo else None
   password = sinfo['aaf_password'] if 'aaf_password' in sinfo else None
   if user and password:
-    return { 'auth': (user, password) }
+    token = base64.b64encode('{0}:{1}'.format(user, password).encode('utf-8')).decode('ascii')
+    return { 'Authorization': 'Basic {0}'.format(token) }
   else:
     return {}
 
+def _cambria(partition, data):
+  """
+  Frame one record in the Cambria format, in UTF-8: len(partition).len(data).partition data,
+  with the lengths in bytes
+  """
+  partition = partition.encode('utf-8')
+  data = data.encode('utf-8')
+  return '{0}.{1}.'.format(len(partition), len(data)).encode('ascii') + partition + data
+
+def _logbatcherror(stream, records, error):
+  _logger.error('Failed to publish %d records to stream %s: %s', len(records), stream, error)
+
+def _logpollerror(stream, error):
+  _logger.error('Failed to poll stream %s: %s', stream, error)
+
+class _Batcher:
+  """
+  Accumulates records for one stream, and publishes them, many per request,
+  from a background thread.
+  """
+  def __init__(self, env, stream, maxrecords, maxbytes, linger_ms, errorCB):
+    self._env = env
+    self._stream = stream
+    self._maxrecords = maxrecords
+    self._maxbytes = maxbytes
+    self._linger = linger_ms / 1000.0
+    self._errorCB = errorCB
+    self._cond = Condition()
+    self._records = []
+    # when each queued record was sent, so the oldest one sets the linger deadline
+    self._arrivals = []
+    self._bytes = 0
+    self._sending = False
+    self._flushing = False
+    self._closed = False
+    self._thread = Thread(target=self._run, name='batcher-{0}'.format(stream))
+    self._thread.daemon = True
+    self._thread.start()
+
+  def send(self, partition, data):
+    """
+    Queue a record to be published.  Blocks while a backlog of several full
+    batches is waiting to be sent.
+    """
+    with self._cond:
+      while len(self._records) >= 4 * self._maxrecords and not self._closed:
+        self._cond.wait()
+      if self._closed:
+        raise ValueError('batcher for stream {0} is closed'.format(self._stream))
+      self._records.append((partition, data))
+      self._arrivals.append(time.time())
+      self._bytes += len(partition) + len(data)
+      self._cond.notify_all()
+
+  def flush(self):
+    """
+    Publish the queued records now, and wait until they have been sent.
+    """
+    with self._cond:
+      self._flushing = True
+      self._cond.notify_all()
+      while self._records or self._sending:
+        self._cond.wait()
+      self._flushing = False
+
+  def close(self):
+    """
+    Publish the queued records, and stop the background thread.
+    """
+    with self._cond:
+      self._closed = True
+      self._cond.notify_all()
+    self._thread.join()
+
+  def _due(self):
+    if not self._records:
+      return 0
+    if self._closed or self._flushing or len(self._records) >= self._maxrecords or self._bytes >= self._maxbytes:
+      return 0
+    return self._arrivals[0] + self._linger - time.time()
+
+  def _take(self):
+    """
+    Remove the next batch, within the size limits, from the queue
+    """
+    count = 0
+    size = 0
+    while count < len(self._records) and count < self._maxrecords:
+      partition, data = self._records[count]
+      if count and size + len(partition) + len(data) > self._maxbytes:
+        break
+      size += len(partition) + len(data)
+      count += 1
+    batch = self._records[:count]
+    del self._records[:count]
+    del self._arrivals[:count]
+    self._bytes -= size
+    return batch
+
+  def _run(self):
+    while True:
+      with self._cond:
+        while True:
+          if self._closed and not self._records:
+            return
+          wait = self._due()
+          if self._records and wait <= 0:
+            break
+          self._cond.wait(wait if self._records else None)
+        batch = self._take()
+        self._sending = True
+        self._cond.notify_all()
+      try:
+        self._env.senddata_batch(self._stream, batch)
+      except Exception as e:
+        try:
+          self._errorCB(self._stream, batch, e)
+        except Exception:
+          _logger.exception('Batch error callback failed')
+      with self._cond:
+        self._sending = False
+        self._cond.notify_all()
+
+def _recordsize(record):
+  return len(record) if isinstance(record, str) else len(json.dumps(record))
+
+class _Unread:
+  """
+  The records received for one stream and not yet returned, oldest first.
+  Use it with its cond held.  The events of multi-stream consumers waiting
+  for it are set, like cond is notified, when records or an error arrive.
+  """
+  def __init__(self):
+    self.records = deque()
+    # the size of each record, measured once when it is added
+    self.sizes = deque()
+    self.bytes = 0
+    self.cond = Condition()
+    self.events = []
+
+  def wake(self):
+    self.cond.notify_all()
+    for event in self.events:
+      event.set()
+
+  def add(self, records):
+    sizes = [_recordsize(record) for record in records]
+    self.records.extend(records)
+    self.sizes.extend(sizes)
+    self.bytes += sum(sizes)
+    self.wake()
+
+  def take(self, count):
+    ret = []
+    while self.records and len(ret) < count:
+      ret.append(self.records.popleft())
+      self.bytes -= self.sizes.popleft()
+    if ret:
+      self.cond.notify_all()
+    return ret
+
+class _Prefetcher:
+  """
+  Keeps long-polling Message Router for one stream from a background thread,
+  adding up to maxbuffered records, or maxbytes of them, to its unread buffer.
+  """
+  def __init__(self, env, stream, unread, maxbuffered, maxbytes, timeout_ms, limit):
+    self._env = env
+    self._stream = stream
+    self._unread = unread
+    self._maxbuffered = maxbuffered
+    self._maxbytes = maxbytes
+    self._timeout_ms = timeout_ms
+    self._limit = limit
+    self._error = None
+    self._stopped = Event()
+    self._thread = Thread(target=self._run, name='prefetch-{0}'.format(stream))
+    self._thread.daemon = True
+    self._thread.start()
+
+  def get(self, count, timeout_ms):
+    """
+    Return up to count buffered records, waiting up to timeout_ms for some,
+    or an empty list.  An error of the background polls is raised, once, instead.
+    """
+    deadline = time.time() + timeout_ms / 1000.0
+    unread = self._unread
+    with unread.cond:
+      while not unread.records:
+        error = self.takeerror()
+        if error is not None:
+          raise error
+        remaining = deadline - time.time()
+        if remaining <= 0 or self._stopped.is_set():
+          return []
+        unread.cond.wait(remaining)
+      return unread.take(count)
+
+  def takeerror(self):
+    """
+    Return the error of the background polls not yet reported, if any, and
+    forget it, so that it is reported once.  Use it with the unread buffer's
+    cond held.
+    """
+    error, self._error = self._error, None
+    return error
+
+  def stopped(self):
+    return self._stopped.is_set()
+
+  def stop(self):
+    """
+    Stop polling.  A poll in progress is not waited for, and what it returns is dropped.
+    """
+    self._stopped.set()
+    with self._unread.cond:
+      self._unread.wake()
+
+  def _full(self):
+    return len(self._unread.records) + self._limit > self._maxbuffered or self._unread.bytes >= self._maxbytes
+
+  def _run(self):
+    backoff = 0
+    unread = self._unread
+    while not self._stopped.is_set():
+      with unread.cond:
+        # backpressure: do not ask for more than there is room for
+        while self._full() and not self._stopped.is_set():
+          unread.cond.wait()
+      if self._stopped.is_set():
+        return
+      try:
+        records = self._env._poll(self._stream, self._timeout_ms, self._limit, True)
+        backoff = 0
+      except Exception as e:
+        with unread.cond:
+          self._error = e
+          unread.wake()
+        backoff = min(30.0, backoff * 2 or 0.5)
+        self._stopped.wait(backoff)
+        continue
+      if records and not self._stopped.is_set():
+        with unread.cond:
+          unread.add(records)
+
+class _PollTuner:
+  """
+  Chooses the limit and timeout of the polls of one stream: the limit
+  doubles, up to maxlimit, while polls come back full, and halves, down to
+  minlimit, while they come back less than a quarter full; the timeout is
+  the time the observed arrival rate takes to fill the limit, between
+  mintimeout_ms and maxtimeout_ms, and doubles after each empty poll, so an
+  idle stream is polled rarely.
+  Updates from concurrent polls may be lost, which only slows the tuning.
+  """
+  # weight of the latest poll in the arrival rate estimate
+  _alpha = 0.3
+
+  def __init__(self, minlimit, maxlimit, mintimeout_ms, maxtimeout_ms):
+    self.minlimit = minlimit
+    self.maxlimit = maxlimit
+    self.mintimeout_ms = mintimeout_ms
+    self.maxtimeout_ms = maxtimeout_ms
+    self.limit = minlimit
+    self.timeout_ms = maxtimeout_ms
+    # records per second
+    self.rate = None
+
+  def update(self, limit, count, elapsed):
+    """
+    Adjust to a poll, asking for limit records, that returned count of them after elapsed seconds
+    """
+    if count >= limit:
+      self.limit = min(self.maxlimit, self.limit * 2)
+    elif count * 4 < limit:
+      self.limit = max(self.minlimit, self.limit // 2)
+    if count == 0:
+      # nothing arrived: back off towards long polls, and let the rate estimate decay
+      self.timeout_ms = min(self.maxtimeout_ms, self.timeout_ms * 2)
+      if self.rate is not None:
+        self.rate *= 1 - self._alpha
+      return
+    observed = count / max(elapsed, 0.001)
+    self.rate = observed if self.rate is None else self._alpha * observed + (1 - self._alpha) * self.rate
+    self.timeout_ms = int(min(self.maxtimeout_ms, max(self.mintimeout_ms, 1000.0 * self.limit / self.rate)))
+
+class _Stream:
+  """
+  Connection state for one data stream: its configuration, and a session
+  keeping its connections to Message Router alive, with authentication
+  computed once.
+  """
+  def __init__(self, sinfo, poolsize):
+    self.sinfo = sinfo
+    self.url = sinfo['dmaap_info']['topic_url']
+    self.session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=poolsize)
+    self.session.mount('http://', adapter)
+    self.session.mount('https://', adapter)
+    self.session.headers.update(_genauth(sinfo))
+
+  def close(self):
+    self.session.close()
+
 class DcaeEnv:
-  def __init__(self, healthCB = lambda:True, reconfigCB = lambda:None):
+  def __init__(self, healthCB = lambda:True, reconfigCB = lambda:None, poolsize = None, conntimeout = None, readtimeout = None, maxunreadbytes = None, healthinterval = None, healthmaxage = None):
     """
     Initialize environment, but don't start web server or invoke any callbacks.
+    poolsize, conntimeout, readtimeout, maxunreadbytes, healthinterval and
+    healthmaxage override the DCAEPOOLSIZE, DCAECONNTIMEOUT, DCAEREADTIMEOUT,
+    DCAEMAXUNREADBYTES, DCAEHEALTHINTERVAL and DCAEHEALTHMAXAGE environment
+    variables.
     """
     self._health = healthCB
+    self._healthcheck = _HealthCheck(healthCB, healthinterval if healthinterval is not None else _healthinterval, healthmaxage if healthmaxage is not None else _healthmaxage)
     self._reconf = reconfigCB
     self._unread = {}
     self._server = None
+    self._reconfigurer = None
+    self._poolsize = poolsize if poolsize is not None else _poolsize
+    self._conntimeout = conntimeout if conntimeout is not None else _conntimeout
+    self._readtimeout = readtimeout if readtimeout is not None else _readtimeout
+    self._maxunreadbytes = maxunreadbytes if maxunreadbytes is not None else _maxunreadbytes
+    self._streams = {}
+    self._streamslock = Lock()
+    self._batchers = {}
+    self._prefetchers = {}
+    self._tuners = {}
+    self.metrics = m = Registry()
+    self._m_consumed = m.counter('dcae_records_consumed_total', 'Records received from Message Router', ('stream',))
+    self._m_consumedbytes = m.counter('dcae_bytes_consumed_total', 'Bytes of record data received from Message Router', ('stream',))
+    self._m_emptypolls = m.counter('dcae_empty_polls_total', 'Polls of Message Router that returned no record', ('stream',))
+    self._m_polltime = m.histogram('dcae_poll_duration_seconds', 'Time taken by polls of Message Router', ('stream',))
+    self._m_published = m.counter('dcae_records_published_total', 'Records published to Message Router', ('stream',))
+    self._m_publishedbytes = m.counter('dcae_bytes_published_total', 'Bytes of the request bodies published to Message Router', ('stream',))
+    self._m_httperrors = m.counter('dcae_http_errors_total', 'Failed requests to Message Router', ('stream', 'operation'))
+    m.gauge('dcae_unread_records', 'Records received and not yet returned', lambda: [((stream,), len(unread.records)) for stream, unread in list(self._unread.items())], ('stream',))
+    m.gauge('dcae_unread_bytes', 'Bytes of records received and not yet returned', lambda: [((stream,), unread.bytes) for stream, unread in list(self._unread.items())], ('stream',))
+    self._m_reconfigure = m.histogram('dcae_reconfigure_duration_seconds', 'Time taken to reload the configuration and call the reconfigure callback')
     self._loadconfig()
 
   def start(self):
     """
-    Start web server to receive health checks and reconfigure requests
+    Start web server to receive health checks and reconfigure requests.
+    The web server answers each request on its own thread.  Reconfigure
+    requests are answered at once, and handled in the background by a
+    single thread, which handles requests that arrive while it is busy
+    together, once it is done.
     """
     if self._server is not None:
       return
-    self._server = HTTPServer(('', _httpport), _handler)
+    self._reconfigurer = _Reconfigurer(self)
+    self._healthcheck.start()
+    self._server = _server(('', _httpport), _handler)
     self._server.env = self
     th = Thread(target=self._server.serve_forever, name='webserver')
     th.daemon = True
@@ -91,53 +587,245 @@ class DcaeEnv:
     if self._server is None:
       return
     self._server.shutdown()
+    self._server.server_close()
     self._server.env = None
     self._server = None
+    self._reconfigurer.stop()
+    self._healthcheck.stop()
 
   def _loadconfig(self):
     self._config = get_config()
 
+  def _getstream(self, kind, stream):
+    """
+    Return the connection state for a stream in the streams_subscribes or
+    streams_publishes configuration, replacing it if the stream's
+    configuration changed.
+    """
+    sinfo = self._config[kind][stream]
+    st = self._streams.get((kind, stream))
+    if st is not None and st.sinfo is sinfo:
+      return st
+    with self._streamslock:
+      st = self._streams.get((kind, stream))
+      if st is None or st.sinfo != sinfo:
+        if st is not None:
+          st.close()
+        st = _Stream(sinfo, self._poolsize)
+      else:
+        st.sinfo = sinfo
+      self._streams[(kind, stream)] = st
+      return st
+
+  def close(self):
+    """
+    Publish what the batchers still hold, stop the batchers and prefetching
+    consumers, and close the connections to Message Router.
+    """
+    with self._streamslock:
+      batchers = list(self._batchers.values())
+      self._batchers = {}
+      prefetchers = list(self._prefetchers.values())
+      self._prefetchers = {}
+    for batcher in batchers:
+      batcher.close()
+    for prefetcher in prefetchers:
+      prefetcher.stop()
+    with self._streamslock:
+      for st in self._streams.values():
+        st.close()
+      self._streams = {}
+
   def hasdata(self, stream):
     """
     Return whether there is any unprocessed received data for the specified
     data stream.  That is, if an earlier getdata() call returned more than
-    one record, and the additional records have not yet been retrieved.
+    one record, and the additional records have not yet been retrieved, or
+    if the stream's prefetching consumer has records buffered.
     """
-    return stream in self._unread
+    return stream in self._unread and len(self._unread[stream].records) > 0
+
+  def prefetch(self, stream, maxbuffered = 1000, timeout_ms = 15000, limit = 100):
+    """
+    Start polling the specified stream in the background, keeping up to
+    maxbuffered records (or the DcaeEnv's maxunreadbytes of them) ready for
+    getdata() and getbatch(), which then no longer wait for a round trip to
+    Message Router while records arrive.  timeout_ms and limit are those of
+    the background polls; the ones given to getdata() only bound how long it
+    waits for a record.  An error of a background poll is raised by the next
+    getdata() or getbatch() that finds no record buffered.
+    """
+    with self._streamslock:
+      if stream not in self._prefetchers:
+        self._prefetchers[stream] = _Prefetcher(self, stream, self._getunread(stream), max(maxbuffered, limit), self._maxunreadbytes, timeout_ms, limit)
+
+  def consume(self, streams = None, quantum = 10, maxbuffered = 1000, timeout_ms = 15000, limit = 100, errorCB = _logpollerror):
+    """
+    Return an iterator over the records of many streams (by default, all
+    those in streams_subscribes), yielding (stream, record) tuples as records
+    arrive.  Each stream is prefetched, as by prefetch(), on its own thread,
+    so an idle stream's long polls never hold up the others, and a busy
+    stream stops being polled once maxbuffered of its records wait.  Streams
+    with records waiting are served in turn, up to quantum records each.
+    When polling a stream fails, errorCB(stream, exception) is called, and
+    polling goes on.  The iterator ends when the DcaeEnv is closed.
+    """
+    if streams is None:
+      streams = sorted(self._config['streams_subscribes'])
+    sources = []
+    for stream in streams:
+      self.prefetch(stream, maxbuffered, timeout_ms, limit)
+      sources.append((stream, self._getunread(stream), self._prefetchers[stream]))
+    return self._consume(sources, quantum, errorCB)
+
+  def _consume(self, sources, quantum, errorCB):
+    ready = Event()
+    for stream, unread, prefetcher in sources:
+      with unread.cond:
+        unread.events.append(ready)
+    try:
+      while True:
+        # cleared before looking, so records arriving meanwhile are not missed
+        ready.clear()
+        found = False
+        for stream, unread, prefetcher in sources:
+          with unread.cond:
+            records = unread.take(quantum)
+            error = prefetcher.takeerror()
+          if error is not None:
+            errorCB(stream, error)
+          for record in records:
+            yield stream, record
+          found = found or len(records) > 0
+        if not found:
+          if all([prefetcher.stopped() for stream, unread, prefetcher in sources]):
+            return
+          ready.wait()
+    finally:
+      for stream, unread, prefetcher in sources:
+        with unread.cond:
+          unread.events.remove(ready)
+
+  def _getunread(self, stream):
+    unread = self._unread.get(stream)
+    if unread is None:
+      unread = self._unread.setdefault(stream, _Unread())
+    return unread
 
   def getdata(self, stream, timeout_ms = 15000, limit = 10):
     """
     Try to retrieve data from Message Router for the specified data stream.
     If no data is retrieved, within the specified timeout, return None.
     """
-    sinfo = self._config['streams_subscribes'][stream]
-    if stream in self._unread:
-      x = self._unread[stream]
-      ret = x.pop()
-      if len(x) == 0:
-        del self._unread[stream]
+    ret = self.getbatch(stream, 1, timeout_ms, limit)
+    return ret[0] if ret else None
+
+  def getbatch(self, stream, max_records = 100, timeout_ms = 15000, limit = None):
+    """
+    Like getdata(), but return a list of up to max_records records: the
+    unprocessed received records, or else those of a new poll, which asks
+    for limit records (default max_records).  The list is empty if no data
+    is retrieved within the specified timeout.
+    """
+    unread = self._getunread(stream)
+    with unread.cond:
+      ret = unread.take(max_records)
+    if ret:
       return ret
+    prefetcher = self._prefetchers.get(stream)
+    if prefetcher is not None:
+      return prefetcher.get(max_records, timeout_ms)
+    x = self._poll(stream, timeout_ms, limit or max_records)
+    if len(x) > max_records:
+      with unread.cond:
+        unread.add(x[max_records:])
+      del x[max_records:]
+    return x
+
+  def adaptive(self, stream, minlimit = 10, maxlimit = 1000, mintimeout_ms = 100, maxtimeout_ms = 15000):
+    """
+    Tune the polls of the specified stream to the traffic on it: ask for more
+    records, up to maxlimit, while polls come back full, and for fewer, down
+    to minlimit, while they come back mostly empty; and wait, between
+    mintimeout_ms and maxtimeout_ms, about as long as records take to arrive
+    to fill a poll.  Polls made by getdata() and getbatch() then ask for the
+    tuned number of records, keeping those beyond what was asked for unread,
+    and wait no longer than their timeout_ms; those of a prefetching consumer
+    ask for no more than its limit.
+    """
+    self._tuners[stream] = _PollTuner(minlimit, maxlimit, mintimeout_ms, maxtimeout_ms)
+
+  def _poll(self, stream, timeout_ms, limit, limited = False):
+    """
+    Long-poll Message Router once for the specified stream, and return the
+    list of records.  If the stream is adaptive, the tuned limit and timeout
+    are used instead, with timeout_ms (and, if limited, limit) as the maximum.
+    """
+    st = self._getstream('streams_subscribes', stream)
+    sinfo = st.sinfo
     gid = sinfo['client_id'] if 'client_id' in sinfo and sinfo['client_id'] else _groupid
-    resp = requests.get('{0}/{1}/{2}?timeout={3}&limit={4}'.format(sinfo['dmaap_info']['topic_url'], gid, _clientid, timeout_ms, limit), **_genauth(sinfo))
-    resp.raise_for_status()
-    x = resp.json()
-    if len(x) == 0:
-      return None
-    if len(x) == 1:
-      return x[0]
-    x.reverse()
-    ret = x.pop()
-    self._unread[stream] = x
-    return ret
+    tuner = self._tuners.get(stream)
+    if tuner is not None:
+      timeout_ms = min(timeout_ms, tuner.timeout_ms)
+      limit = min(limit, tuner.limit) if limited else tuner.limit
+    start = time.time()
+    try:
+      resp = st.session.get('{0}/{1}/{2}?timeout={3}&limit={4}'.format(st.url, gid, _clientid, timeout_ms, limit), timeout=(self._conntimeout, timeout_ms / 1000.0 + self._readtimeout))
+      resp.raise_for_status()
+      records = resp.json()
+    except Exception:
+      self._m_httperrors(stream, 'poll').inc()
+      raise
+    elapsed = time.time() - start
+    self._m_polltime(stream).observe(elapsed)
+    if tuner is not None:
+      tuner.update(limit, len(records), elapsed)
+    if records:
+      self._m_consumed(stream).inc(len(records))
+      self._m_consumedbytes(stream).inc(len(resp.content))
+    else:
+      self._m_emptypolls(stream).inc()
+    return records
 
   def senddata(self, stream, partition, data):
     """
     Publish data to the specified stream.
     """
-    sinfo = self._config['streams_publishes'][stream]
-    body = '{0}.{1}.{2}{3}'.format(len(partition), len(data), partition, data)
-    resp = requests.post('{0}'.format(sinfo['dmaap_info']['topic_url']), headers={'Content-Type': 'application/cambria'}, data=body, **_genauth(sinfo))
-    resp.raise_for_status()
+    self._post(stream, _cambria(partition, data), 1)
+
+  def senddata_batch(self, stream, records):
+    """
+    Publish many records to the specified stream, in a single request.
+    records is a sequence of (partition, data) tuples.
+    """
+    if records:
+      self._post(stream, b''.join([_cambria(partition, data) for partition, data in records]), len(records))
+
+  def batcher(self, stream, maxrecords = 100, maxbytes = 1000000, linger_ms = 50, errorCB = _logbatcherror):
+    """
+    Return the background batcher of the specified stream, starting it if
+    needed.  Its send(partition, data) queues a record, which is published
+    with others once maxrecords records or maxbytes bytes are queued, or
+    linger_ms after the oldest queued record.  When publishing a batch fails,
+    errorCB(stream, records, exception) is called.  flush() sends the queued
+    records now, and close() (or the DcaeEnv's close()) stops the batcher.
+    """
+    with self._streamslock:
+      batcher = self._batchers.get(stream)
+      if batcher is None or batcher._closed:
+        batcher = self._batchers[stream] = _Batcher(self, stream, maxrecords, maxbytes, linger_ms, errorCB)
+      return batcher
+
+  def _post(self, stream, body, count):
+    st = self._getstream('streams_publishes', stream)
+    try:
+      resp = st.session.post(st.url, headers={'Content-Type': 'application/cambria'}, data=body, timeout=(self._conntimeout, self._readtimeout))
+      resp.raise_for_status()
+    except Exception:
+      self._m_httperrors(stream, 'publish').inc()
+      raise
+    self._m_published(stream).inc(count)
+    self._m_publishedbytes(stream).inc(len(body))
 
   def getconfig(self):
     """
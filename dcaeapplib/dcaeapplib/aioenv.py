@@ -0,0 +1,218 @@
+# org.onap.dcae
+# ============LICENSE_START====================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# =============================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END======================================================
+#
+# ECOMP is a trademark and service mark of AT&T Intellectual Property.
+
+"""
+asyncio version of DcaeEnv
+
+AsyncDcaeEnv serves /healthcheck and /reconfigure on the running event loop,
+and talks to Message Router through a pooled aiohttp session per stream, so
+an asyncio application needs no thread per stream.  It needs Python 3.7
+or later, and aiohttp:
+pip install dcaeapplib[async]
+"""
+
+import asyncio
+from collections import deque
+import inspect
+
+try:
+  import aiohttp
+  from aiohttp import web
+except ImportError:  # pragma: no cover
+  aiohttp = None
+
+import dcaeapplib
+
+async def _call(callback):
+  """
+  Call a callback that may be a plain function or a coroutine function
+  """
+  ret = callback()
+  if inspect.isawaitable(ret):
+    ret = await ret
+  return ret
+
+class _AsyncStream:
+  """
+  Connection state for one data stream, like dcaeapplib._Stream
+  """
+  def __init__(self, sinfo, poolsize):
+    self.sinfo = sinfo
+    self.url = sinfo['dmaap_info']['topic_url']
+    self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=poolsize), headers=dcaeapplib._genauth(sinfo))
+
+  async def close(self):
+    await self.session.close()
+
+class AsyncDcaeEnv:
+  def __init__(self, healthCB = lambda:True, reconfigCB = lambda:None, poolsize = None, conntimeout = None, readtimeout = None):
+    """
+    Initialize environment, but don't start web server or invoke any callbacks.
+    healthCB and reconfigCB may be coroutine functions.  The other arguments
+    are those of DcaeEnv.
+    """
+    if aiohttp is None:
+      raise ImportError('AsyncDcaeEnv needs aiohttp: pip install dcaeapplib[async]')
+    self._health = healthCB
+    self._reconf = reconfigCB
+    self._poolsize = poolsize if poolsize is not None else dcaeapplib._poolsize
+    self._conntimeout = conntimeout if conntimeout is not None else dcaeapplib._conntimeout
+    self._readtimeout = readtimeout if readtimeout is not None else dcaeapplib._readtimeout
+    self._unread = {}
+    self._streams = {}
+    self._runner = None
+    self._config = dcaeapplib.get_config()
+
+  async def start(self):
+    """
+    Start web server, on the running event loop, to receive health checks and reconfigure requests
+    """
+    if self._runner is not None:
+      return
+    app = web.Application()
+    app.router.add_get('/healthcheck', self._healthcheck)
+    app.router.add_get('/reconfigure', self._reconfigure)
+    self._runner = web.AppRunner(app, access_log=None)
+    await self._runner.setup()
+    # all IPv4 interfaces, like DcaeEnv
+    await web.TCPSite(self._runner, host='0.0.0.0', port=dcaeapplib._httpport).start()
+
+  async def stop(self):
+    """
+    Stop web server
+    """
+    if self._runner is None:
+      return
+    runner, self._runner = self._runner, None
+    await runner.cleanup()
+
+  @property
+  def port(self):
+    """
+    The port the web server listens on, or None if it is not running
+    """
+    if self._runner is None or not self._runner.addresses:
+      return None
+    return self._runner.addresses[0][1]
+
+  async def _healthcheck(self, request):
+    if await _call(self._health):
+      return web.Response(status=202)
+    return web.Response(status=503)
+
+  async def _reconfigure(self, request):
+    await self.loadconfig()
+    await _call(self._reconf)
+    return web.Response(status=202)
+
+  async def loadconfig(self):
+    """
+    Fetch the configuration again, without blocking the event loop
+    """
+    self._config = await asyncio.get_running_loop().run_in_executor(None, dcaeapplib.get_config)
+
+  def getconfig(self):
+    """
+    Get the latest version of the configuration data.
+    """
+    return self._config
+
+  async def _getstream(self, kind, stream):
+    sinfo = self._config[kind][stream]
+    st = self._streams.get((kind, stream))
+    if st is not None and st.sinfo == sinfo and not st.session.closed:
+      st.sinfo = sinfo
+      return st
+    old, st = st, _AsyncStream(sinfo, self._poolsize)
+    self._streams[(kind, stream)] = st
+    if old is not None:
+      await old.close()
+    return st
+
+  async def close(self):
+    """
+    Close the connections to Message Router.
+    """
+    streams, self._streams = self._streams, {}
+    for st in streams.values():
+      await st.close()
+
+  def hasdata(self, stream):
+    """
+    Return whether there is any unprocessed received data for the specified data stream.
+    """
+    return len(self._unread.get(stream, ())) > 0
+
+  async def getdata(self, stream, timeout_ms = 15000, limit = 10):
+    """
+    Try to retrieve data from Message Router for the specified data stream.
+    If no data is retrieved, within the specified timeout, return None.
+    """
+    ret = await self.getbatch(stream, 1, timeout_ms, limit)
+    return ret[0] if ret else None
+
+  async def getbatch(self, stream, max_records = 100, timeout_ms = 15000, limit = None):
+    """
+    Like getdata(), but return a list of up to max_records records, as DcaeEnv.getbatch() does.
+    """
+    unread = self._unread.get(stream)
+    if unread:
+      return [unread.popleft() for i in range(min(max_records, len(unread)))]
+    x = await self._poll(stream, timeout_ms, limit or max_records)
+    if len(x) > max_records:
+      self._unread.setdefault(stream, deque()).extend(x[max_records:])
+      del x[max_records:]
+    return x
+
+  async def records(self, stream, timeout_ms = 15000, limit = 10):
+    """
+    Iterate asynchronously over the records of the specified data stream, as they arrive:
+    async for record in env.records('myinputstream'): ...
+    """
+    while True:
+      for record in await self.getbatch(stream, limit, timeout_ms, limit):
+        yield record
+
+  async def _poll(self, stream, timeout_ms, limit):
+    st = await self._getstream('streams_subscribes', stream)
+    sinfo = st.sinfo
+    gid = sinfo['client_id'] if 'client_id' in sinfo and sinfo['client_id'] else dcaeapplib._groupid
+    timeout = aiohttp.ClientTimeout(sock_connect=self._conntimeout, sock_read=timeout_ms / 1000.0 + self._readtimeout)
+    async with st.session.get('{0}/{1}/{2}'.format(st.url, gid, dcaeapplib._clientid), params={'timeout': str(timeout_ms), 'limit': str(limit)}, timeout=timeout) as resp:
+      resp.raise_for_status()
+      return await resp.json(content_type=None)
+
+  async def senddata(self, stream, partition, data):
+    """
+    Publish data to the specified stream.
+    """
+    await self._post(stream, dcaeapplib._cambria(partition, data))
+
+  async def senddata_batch(self, stream, records):
+    """
+    Publish many (partition, data) records to the specified stream, in a single request.
+    """
+    if records:
+      await self._post(stream, b''.join([dcaeapplib._cambria(partition, data) for partition, data in records]))
+
+  async def _post(self, stream, body):
+    st = await self._getstream('streams_publishes', stream)
+    timeout = aiohttp.ClientTimeout(sock_connect=self._conntimeout, sock_read=self._readtimeout)
+    async with st.session.post(st.url, data=body, headers={'Content-Type': 'application/cambria'}, timeout=timeout) as resp:
+      resp.raise_for_status()
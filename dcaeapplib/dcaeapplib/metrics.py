@@ -0,0 +1,202 @@
+# org.onap.dcae
+# ============LICENSE_START====================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# =============================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END======================================================
+#
+# ECOMP is a trademark and service mark of AT&T Intellectual Property.
+
+"""
+In-process metrics, rendered in the Prometheus text format
+
+Counters and histograms keep a cell per thread that updates them, which only
+that thread writes, so updating them takes no lock; rendering adds the cells
+up.  The cells of threads that have ended are folded into a base total.
+Gauges are read by calling a function when rendering.
+"""
+
+from bisect import bisect_left
+from threading import Lock, current_thread, local
+
+# seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _escape(value):
+  return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _labeltext(names, values, extra = None):
+  pairs = ['{0}="{1}"'.format(name, _escape(value)) for name, value in zip(names, values)]
+  if extra is not None:
+    pairs.append('{0}="{1}"'.format(extra[0], _escape(extra[1])))
+  return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _number(value):
+  if value == float('inf'):
+    return '+Inf'
+  return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Cells:
+  """
+  One list of numbers per live updating thread, plus the totals of the
+  threads that have ended, whose cells can no longer change
+  """
+  def __init__(self, size):
+    self._size = size
+    self._local = local()
+    self._lock = Lock()
+    self._base = [0] * size
+    self._cells = []
+
+  def mine(self):
+    try:
+      return self._local.cell
+    except AttributeError:
+      cell = self._local.cell = [0] * self._size
+      with self._lock:
+        self._prune()
+        self._cells.append((current_thread(), cell))
+      return cell
+
+  def _prune(self):
+    live = []
+    for thread, cell in self._cells:
+      if thread.is_alive():
+        live.append((thread, cell))
+      else:
+        for i, value in enumerate(cell):
+          self._base[i] += value
+    self._cells = live
+
+  def total(self):
+    with self._lock:
+      self._prune()
+      ret = list(self._base)
+      for thread, cell in self._cells:
+        for i, value in enumerate(cell):
+          ret[i] += value
+    return ret
+
+class Counter:
+  """
+  A monotonically increasing count, for one set of label values
+  """
+  def __init__(self):
+    self._cells = _Cells(1)
+
+  def inc(self, amount = 1):
+    self._cells.mine()[0] += amount
+
+  def value(self):
+    return self._cells.total()[0]
+
+class Histogram:
+  """
+  Counts of observed values by bucket, with their sum, for one set of label values
+  """
+  def __init__(self, buckets):
+    self._buckets = buckets
+    # a count per bucket, then one for values above the last bucket, then the sum
+    self._cells = _Cells(len(buckets) + 2)
+
+  def observe(self, value):
+    cell = self._cells.mine()
+    cell[bisect_left(self._buckets, value)] += 1
+    cell[-1] += value
+
+  def value(self):
+    """
+    Return the cumulative counts for each bucket, +Inf included, and the sum
+    """
+    total = self._cells.total()
+    counts = []
+    running = 0
+    for count in total[:-1]:
+      running += count
+      counts.append(running)
+    return counts, total[-1]
+
+class _Family:
+  def __init__(self, name, help, kind, labels, make):
+    self.name = name
+    self.help = help
+    self.kind = kind
+    self.labels = tuple(labels)
+    self._make = make
+    self._children = {}
+    self._lock = Lock()
+
+  def child(self, *values):
+    child = self._children.get(values)
+    if child is None:
+      with self._lock:
+        child = self._children.get(values)
+        if child is None:
+          child = self._children[values] = self._make()
+    return child
+
+  def samples(self):
+    return sorted(self._children.items())
+
+class Registry:
+  """
+  A set of named metrics.  counter() and histogram() return a function
+  that, given the values of the metric's labels, returns the Counter or
+  Histogram for them; gauge() registers a function returning the current
+  (label values, value) pairs.
+  """
+  def __init__(self):
+    self._families = []
+    self._lock = Lock()
+
+  def _add(self, family):
+    with self._lock:
+      if any([f.name == family.name for f in self._families]):
+        raise ValueError('Duplicate metric {0}'.format(family.name))
+      self._families.append(family)
+    return family
+
+  def counter(self, name, help, labels = ()):
+    return self._add(_Family(name, help, 'counter', labels, Counter)).child
+
+  def histogram(self, name, help, labels = (), buckets = DEFAULT_BUCKETS):
+    buckets = tuple(sorted(buckets))
+    return self._add(_Family(name, help, 'histogram', labels, lambda: Histogram(buckets))).child
+
+  def gauge(self, name, help, fn, labels = ()):
+    family = _Family(name, help, 'gauge', labels, None)
+    family.samples = lambda: sorted(fn())
+    self._add(family)
+
+  def render(self):
+    """
+    Return the metrics in the Prometheus text exposition format, version 0.0.4
+    """
+    with self._lock:
+      families = list(self._families)
+    lines = []
+    for family in families:
+      lines.append('# HELP {0} {1}'.format(family.name, family.help.replace('\\', '\\\\').replace('\n', '\\n')))
+      lines.append('# TYPE {0} {1}'.format(family.name, family.kind))
+      for values, sample in family.samples():
+        if family.kind == 'histogram':
+          counts, total = sample.value()
+          bounds = list(sample._buckets) + [float('inf')]
+          for bound, count in zip(bounds, counts):
+            lines.append('{0}_bucket{1} {2}'.format(family.name, _labeltext(family.labels, values, ('le', _number(bound))), count))
+          lines.append('{0}_sum{1} {2}'.format(family.name, _labeltext(family.labels, values), _number(total)))
+          lines.append('{0}_count{1} {2}'.format(family.name, _labeltext(family.labels, values), counts[-1]))
+        else:
+          value = sample.value() if family.kind == 'counter' else sample
+          lines.append('{0}{1} {2}'.format(family.name, _labeltext(family.labels, values), _number(value)))
+    return '\n'.join(lines) + '\n'
@@ -21,7 +21,7 @@ from setuptools import setup, find_packages
 
 setup(
     name="dcaeapplib",
-    version="1.0.0",
+    version="1.1.0",
     packages=find_packages(),
     author="Andrew Gauld",
     author_email="ag1282@att.com",
@@ -30,5 +30,6 @@ setup(
     url="https://gerrit.onap.org/r/#/admin/projects/dcaegen2/utils",
     zip_safe=True,
     install_requires=["onap-dcae-cbs-docker-client>=2.1.0"],
+    extras_require={"async": ["aiohttp>=3.6.0, < 4.0.0"]},
     entry_points={"console_scripts": ["reconfigure.sh=dcaeapplib:reconfigure"]},
 )
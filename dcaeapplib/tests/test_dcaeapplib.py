@@ -18,8 +18,12 @@
 # ECOMP is a trademark and service mark of AT&T Intellectual Property.
 
 import dcaeapplib
+import pytest
 import requests
 import json
+import sys
+import threading
+import time
 
 class Stubs:
   def __init__(self):
@@ -54,6 +58,10 @@ class Stubs:
   def json(self):
     return self.toreturn
 
+  @property
+  def content(self):
+    return json.dumps(self.toreturn).encode('utf-8')
+
 def test_todo(monkeypatch):
   stuff = Stubs()
   def stub_config():
@@ -72,6 +80,7 @@ def test_todo(monkeypatch):
   stuff.config['anotherparameter'] = 2
   assert env.getconfig()['anotherparameter'] == 1
   dcaeapplib.reconfigure()
+  assert env._reconfigurer.wait(5)
   assert stuff.cc is True
   assert env.getconfig()['anotherparameter'] == 2
   resp = requests.get('http://localhost:{0}/healthcheck'.format(dcaeapplib._httpport))
@@ -83,21 +92,21 @@ def test_todo(monkeypatch):
   assert resp.status_code == 404
   env.start() # exercise start when already running
   env.stop()
-  def stub_get(*args, **kwargs):
-    stuff.auth = 'auth' in kwargs
+  def stub_get(session, url, *args, **kwargs):
+    stuff.auth = 'Authorization' in session.headers
     return stuff
-  def stub_post(url, data, *args, **kwargs):
-    assert data == '4.11.asdfhello world'
-    stuff.auth = 'auth' in kwargs
+  def stub_post(session, url, data, *args, **kwargs):
+    assert data == b'4.11.asdfhello world'
+    stuff.auth = 'Authorization' in session.headers
     stuff.posted = True
     return stuff
-  monkeypatch.setattr(requests, 'post', stub_post)
+  monkeypatch.setattr(requests.Session, 'post', stub_post)
   stuff.posted = False
   stuff.auth = True
   env.senddata('myoutputstream', 'asdf', 'hello world')
   assert stuff.posted == True
   assert stuff.auth == False
-  monkeypatch.setattr(requests, 'get', stub_get)
+  monkeypatch.setattr(requests.Session, 'get', stub_get)
   assert env.hasdata('myinputstream') is False
   assert env.getdata('myinputstream') == 's1'
   assert stuff.auth == True
@@ -110,3 +119,552 @@ def test_todo(monkeypatch):
   stuff.toreturn = []
   assert env.hasdata('myinputstream') is False
   assert env.getdata('myinputstream') is None
+
+def test_sessions(monkeypatch):
+  stuff = Stubs()
+  monkeypatch.setattr(dcaeapplib, 'get_config', lambda: json.loads(json.dumps(stuff.config)))
+  env = dcaeapplib.DcaeEnv(poolsize=2, conntimeout=1.5, readtimeout=3)
+  calls = []
+  def stub_get(session, url, **kwargs):
+    calls.append((session, url, kwargs))
+    return stuff
+  monkeypatch.setattr(requests.Session, 'get', stub_get)
+  stuff.toreturn = [ 'r1' ]
+  assert env.getdata('myinputstream', timeout_ms=1000) == 'r1'
+  assert env.getdata('myinputstream', timeout_ms=1000) == 'r1'
+  assert calls[0][0] is calls[1][0]
+  assert calls[0][2]['timeout'] == (1.5, 4.0)
+  session = calls[0][0]
+  assert session.headers['Authorization'] == 'Basic dXNlcjE6cGFzczE='
+  assert session.get_adapter('http://messagerouter.example.com')._pool_maxsize == 2
+  # the same configuration, reloaded, keeps the session
+  env._loadconfig()
+  env.getdata('myinputstream')
+  assert calls[2][0] is session
+  # a changed stream gets a new one
+  stuff.config['streams_subscribes']['myinputstream']['aaf_password'] = 'pass2'
+  env._loadconfig()
+  env.getdata('myinputstream')
+  assert calls[3][0] is not session
+  assert calls[3][0].headers['Authorization'] == 'Basic dXNlcjE6cGFzczI='
+  env.close()
+
+def test_batches(monkeypatch):
+  stuff = Stubs()
+  monkeypatch.setattr(dcaeapplib, 'get_config', lambda: json.loads(json.dumps(stuff.config)))
+  env = dcaeapplib.DcaeEnv()
+  posted = []
+  lock = threading.Lock()
+  def stub_post(session, url, data, **kwargs):
+    # bodies are UTF-8 bytes
+    data = data.decode('utf-8')
+    if 'fail' in data:
+      raise requests.exceptions.ConnectionError('down')
+    with lock:
+      posted.append(data)
+    return stuff
+  monkeypatch.setattr(requests.Session, 'post', stub_post)
+  env.senddata_batch('myoutputstream', [('k1', 'hello'), ('key2', 'world!')])
+  assert posted == ['2.5.k1hello4.6.key2world!']
+  env.senddata_batch('myoutputstream', [])
+  assert len(posted) == 1
+  # the lengths are those of the UTF-8 bytes
+  env.senddata_batch('myoutputstream', [(u'cl\u00e9', u'\u00e9\u20ac'), ('k', 'z')])
+  assert posted[-1] == u'4.5.cl\u00e9\u00e9\u20ac1.1.kz'
+
+  # full batches are sent straight away
+  del posted[:]
+  batcher = env.batcher('myoutputstream', maxrecords=3, linger_ms=60000)
+  for i in range(7):
+    batcher.send('p', str(i))
+  deadline = time.time() + 5
+  while len(posted) < 2 and time.time() < deadline:
+    time.sleep(0.01)
+  assert posted == ['1.1.p01.1.p11.1.p2', '1.1.p31.1.p41.1.p5']
+  batcher.flush()
+  assert posted[2:] == ['1.1.p6']
+  assert env.batcher('myoutputstream') is batcher
+  # the records left after a batch keep their linger deadline
+  del posted[:]
+  with batcher._cond:
+    for i in range(4):
+      batcher.send('p', str(i))
+    arrived = batcher._arrivals[3]
+  deadline = time.time() + 5
+  while not posted and time.time() < deadline:
+    time.sleep(0.01)
+  with batcher._cond:
+    assert batcher._arrivals == [arrived]
+    now = time.time()
+    assert batcher._due() <= arrived + 60 - now
+  batcher.flush()
+  assert posted == ['1.1.p01.1.p11.1.p2', '1.1.p3']
+
+  # ... and the others after linger_ms
+  del posted[:]
+  errors = []
+  batcher = env.batcher('myoutputstream2', maxbytes=10, linger_ms=20, errorCB=lambda stream, records, e: errors.append((stream, records)))
+  stuff.config['streams_publishes']['myoutputstream2'] = stuff.config['streams_publishes']['myoutputstream']
+  env._loadconfig()
+  batcher.send('p', 'abc')
+  deadline = time.time() + 5
+  while not posted and time.time() < deadline:
+    time.sleep(0.01)
+  assert posted == ['1.3.pabc']
+  batcher.send('p', 'fail')
+  batcher.send('p', 'toolongforonebatch')
+  batcher.flush()
+  assert errors == [('myoutputstream2', [('p', 'fail')])]
+  assert posted[1:] == ['1.18.ptoolongforonebatch']
+  env.close()
+  try:
+    batcher.send('p', 'late')
+    assert False
+  except ValueError:
+    pass
+
+def test_prefetch(monkeypatch):
+  stuff = Stubs()
+  monkeypatch.setattr(dcaeapplib, 'get_config', lambda: json.loads(json.dumps(stuff.config)))
+  env = dcaeapplib.DcaeEnv()
+  batches = [ [ 'r1', 'r2', 'r3' ], [ 'r4' ], 'fail', [ 'r5' ] ]
+  polls = []
+  class Resp:
+    def __init__(self, records):
+      self.records = records
+    def raise_for_status(self):
+      if self.records == 'fail':
+        raise requests.exceptions.HTTPError('503')
+    def json(self):
+      return self.records
+    @property
+    def content(self):
+      return json.dumps(self.records).encode('utf-8')
+  def stub_get(session, url, **kwargs):
+    polls.append(url)
+    if batches:
+      return Resp(batches.pop(0))
+    time.sleep(0.05)
+    return Resp([])
+  monkeypatch.setattr(requests.Session, 'get', stub_get)
+  env.prefetch('myinputstream', maxbuffered=4, timeout_ms=100, limit=2)
+  assert [ env.getdata('myinputstream', timeout_ms=2000) for i in range(4) ] == [ 'r1', 'r2', 'r3', 'r4' ]
+  assert 'timeout=100&limit=2' in polls[0]
+  try:
+    env.getdata('myinputstream', timeout_ms=5000)
+    assert False
+  except requests.exceptions.HTTPError:
+    pass
+  # polling goes on after an error
+  assert env.getdata('myinputstream', timeout_ms=5000) == 'r5'
+  assert env.hasdata('myinputstream') is False
+  assert env.getdata('myinputstream', timeout_ms=50) is None
+  env.close()
+
+def test_prefetch_backpressure(monkeypatch):
+  stuff = Stubs()
+  monkeypatch.setattr(dcaeapplib, 'get_config', lambda: json.loads(json.dumps(stuff.config)))
+  env = dcaeapplib.DcaeEnv()
+  polls = []
+  def stub_get(session, url, **kwargs):
+    polls.append(url)
+    stuff.toreturn = [ 'r{0}'.format(len(polls)) ] * 2
+    return stuff
+  monkeypatch.setattr(requests.Session, 'get', stub_get)
+  env.prefetch('myinputstream', maxbuffered=6, timeout_ms=100, limit=2)
+  deadline = time.time() + 5
+  while not env.hasdata('myinputstream') and time.time() < deadline:
+    time.sleep(0.01)
+  time.sleep(0.1)
+  # the buffer is full: no more polls until records are taken
+  assert len(polls) == 3
+  assert env.getdata('myinputstream') == 'r1'
+  assert env.getdata('myinputstream') == 'r1'
+  deadline = time.time() + 5
+  while len(polls) < 4 and time.time() < deadline:
+    time.sleep(0.01)
+  assert len(polls) == 4
+  env.close()
+
+def test_getbatch(monkeypatch):
+  stuff = Stubs()
+  monkeypatch.setattr(dcaeapplib, 'get_config', lambda: json.loads(json.dumps(stuff.config)))
+  env = dcaeapplib.DcaeEnv()
+  polls = []
+  def stub_get(session, url, **kwargs):
+    polls.append(url)
+    return stuff
+  monkeypatch.setattr(requests.Session, 'get', stub_get)
+  stuff.toreturn = [ 'r{0}'.format(i) for i in range(5) ]
+  assert env.getdata('myinputstream') == 'r0'
+  assert env.getbatch('myinputstream', 3) == [ 'r1', 'r2', 'r3' ]
+  assert env.getbatch('myinputstream', 3) == [ 'r4' ]
+  assert env.hasdata('myinputstream') is False
+  assert len(polls) == 1
+  stuff.toreturn = [ 'a', 'b', 'c' ]
+  assert env.getbatch('myinputstream', 2, timeout_ms=1000) == [ 'a', 'b' ]
+  assert 'timeout=1000&limit=2' in polls[1]
+  assert env.getbatch('myinputstream', 2) == [ 'c' ]
+  stuff.toreturn = []
+  assert env.getbatch('myinputstream') == []
+  assert 'limit=100' in polls[2]
+
+def test_prefetch_bytes(monkeypatch):
+  stuff = Stubs()
+  monkeypatch.setattr(dcaeapplib, 'get_config', lambda: json.loads(json.dumps(stuff.config)))
+  env = dcaeapplib.DcaeEnv(maxunreadbytes=25)
+  polls = []
+  def stub_get(session, url, **kwargs):
+    polls.append(url)
+    stuff.toreturn = [ 'x' * 10 ]
+    return stuff
+  monkeypatch.setattr(requests.Session, 'get', stub_get)
+  env.prefetch('myinputstream', limit=1)
+  deadline = time.time() + 5
+  while len(polls) < 3 and time.time() < deadline:
+    time.sleep(0.01)
+  time.sleep(0.1)
+  # 30 bytes buffered: over the cap, so no fourth poll
+  assert len(polls) == 3
+  assert env._unread['myinputstream'].bytes == 30
+  assert env.getbatch('myinputstream', 2) == [ 'x' * 10 ] * 2
+  deadline = time.time() + 5
+  while len(polls) < 4 and time.time() < deadline:
+    time.sleep(0.01)
+  assert len(polls) >= 4
+  env.close()
+  # the size of a JSON record is measured once, when it arrives
+  dumps = []
+  def stub_dumps(value, _dumps=json.dumps):
+    dumps.append(value)
+    return _dumps(value)
+  monkeypatch.setattr(json, 'dumps', stub_dumps)
+  unread = dcaeapplib._Unread()
+  with unread.cond:
+    unread.add([ {'a': 1}, 'xyz' ])
+    assert unread.bytes == 11
+    assert unread.take(5) == [ {'a': 1}, 'xyz' ]
+    assert unread.bytes == 0
+  assert dumps == [ {'a': 1} ]
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='AsyncDcaeEnv needs Python 3.7')
+def test_asyncenv(monkeypatch):
+  import asyncio
+  from dcaeapplib.aioenv import AsyncDcaeEnv
+  aiohttp = pytest.importorskip('aiohttp')
+  from aiohttp import web
+  stuff = Stubs()
+  monkeypatch.setattr(dcaeapplib, '_httpport', 0)
+  posted = []
+  async def mr_get(request):
+    assert request.headers['Authorization'] == 'Basic dXNlcjE6cGFzczE='
+    assert request.query['limit'] == '3'
+    return web.json_response(stuff.toreturn)
+  async def mr_post(request):
+    assert 'Authorization' not in request.headers
+    posted.append(await request.text())
+    return web.Response(status=200)
+  async def run():
+    app = web.Application()
+    app.router.add_get('/events/topic1/{group}/{client}', mr_get)
+    app.router.add_post('/events/topic2', mr_post)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', 0).start()
+    base = 'http://127.0.0.1:{0}/events/'.format(runner.addresses[0][1])
+    stuff.config['streams_subscribes']['myinputstream']['dmaap_info']['topic_url'] = base + 'topic1'
+    stuff.config['streams_publishes']['myoutputstream']['dmaap_info']['topic_url'] = base + 'topic2'
+    monkeypatch.setattr(dcaeapplib, 'get_config', lambda: json.loads(json.dumps(stuff.config)))
+    async def health():
+      return stuff.health
+    def reconf():
+      stuff.cc = True
+    env = AsyncDcaeEnv(healthCB=health, reconfigCB=reconf)
+    try:
+      await env.start()
+      async with aiohttp.ClientSession() as client:
+        url = 'http://127.0.0.1:{0}/'.format(env.port)
+        async with client.get(url + 'healthcheck') as resp:
+          assert resp.status == 202
+        stuff.health = False
+        async with client.get(url + 'healthcheck') as resp:
+          assert resp.status == 503
+        stuff.config['anotherparameter'] = 2
+        async with client.get(url + 'reconfigure') as resp:
+          assert resp.status == 202
+        assert stuff.cc is True
+        assert env.getconfig()['anotherparameter'] == 2
+
+      stuff.toreturn = [ 's1', 's2', 's3', 's4' ]
+      assert await env.getdata('myinputstream', limit=3) == 's1'
+      assert env.hasdata('myinputstream') is True
+      assert await env.getbatch('myinputstream', 5, limit=3) == [ 's2', 's3', 's4' ]
+      stuff.toreturn = [ 'a1', 'a2' ]
+      received = []
+      async for record in env.records('myinputstream', limit=3):
+        received.append(record)
+        if len(received) == 3:
+          break
+      assert received == [ 'a1', 'a2', 'a1' ]
+
+      await env.senddata('myoutputstream', 'asdf', 'hello world')
+      await env.senddata_batch('myoutputstream', [ ('k', 'a'), ('k', 'bc') ])
+      assert posted == [ '4.11.asdfhello world', '1.1.ka1.2.kbc' ]
+      # the lengths are those of the UTF-8 bytes
+      await env.senddata_batch('myoutputstream', [ (u'cl\u00e9', u'\u00e9\u20ac'), ('k', 'z') ])
+      assert posted[-1] == u'4.5.cl\u00e9\u00e9\u20ac1.1.kz'
+    finally:
+      await env.stop()
+      await env.close()
+      await runner.cleanup()
+  asyncio.run(run())
+
+def test_reconfigure_in_background(monkeypatch):
+  stuff = Stubs()
+  monkeypatch.setattr(dcaeapplib, 'get_config', lambda: json.loads(json.dumps(stuff.config)))
+  monkeypatch.setattr(dcaeapplib, '_httpport', 0)
+  started = threading.Event()
+  release = threading.Event()
+  calls = []
+  def slow_reconf():
+    calls.append(1)
+    started.set()
+    release.wait(5)
+  env = dcaeapplib.DcaeEnv(reconfigCB=slow_reconf)
+  env.start()
+  try:
+    url = 'http://localhost:{0}/'.format(env._server.server_port)
+    assert requests.get(url + 'reconfigure', timeout=2).status_code == 202
+    assert started.wait(5)
+    # health checks are answered while the reconfiguration is running
+    start = time.time()
+    assert requests.get(url + 'healthcheck', timeout=2).status_code == 202
+    assert time.time() - start < 1
+    # requests arriving meanwhile are handled together, once
+    for i in range(5):
+      assert requests.get(url + 'reconfigure', timeout=2).status_code == 202
+    release.set()
+    assert env._reconfigurer.wait(5)
+    assert len(calls) == 2
+  finally:
+    release.set()
+    env.stop()
+
+def test_cached_healthcheck(monkeypatch):
+  stuff = Stubs()
+  monkeypatch.setattr(dcaeapplib, 'get_config', lambda: json.loads(json.dumps(stuff.config)))
+  monkeypatch.setattr(dcaeapplib, '_httpport', 0)
+  calls = []
+  block = threading.Event()
+  def stub_hc():
+    calls.append(1)
+    if len(calls) > 1:
+      block.wait(5)
+    return True
+  env = dcaeapplib.DcaeEnv(healthCB=stub_hc, healthinterval=0.05, healthmaxage=0.5)
+  env.start()
+  try:
+    url = 'http://localhost:{0}/healthcheck'.format(env._server.server_port)
+    resp = requests.get(url, timeout=2)
+    assert resp.status_code == 202
+    report = resp.json()
+    assert report['healthy'] and report['cached']
+    assert report['age_ms'] >= 0 and report['duration_ms'] >= 0
+    # health checks don't call the callback
+    for i in range(10):
+      assert requests.get(url, timeout=2).status_code == 202
+    assert len(calls) <= 2
+    # the callback is stuck, so the result goes stale
+    time.sleep(0.7)
+    resp = requests.get(url, timeout=2)
+    assert resp.status_code == 503
+    assert resp.json()['stale']
+    # stopping doesn't wait for the stuck callback
+    start = time.time()
+    env.stop()
+    assert time.time() - start < 2
+    assert not block.is_set()
+  finally:
+    block.set()
+    env.stop()
+  # without an interval, each health check calls the callback, and errors are reported
+  def bad_hc():
+    raise ValueError('broken')
+  env = dcaeapplib.DcaeEnv(healthCB=bad_hc)
+  healthy, report = env._healthcheck.report()
+  assert not healthy and report['error'] == 'broken' and not report['cached']
+
+def test_metrics(monkeypatch):
+  stuff = Stubs()
+  monkeypatch.setattr(dcaeapplib, 'get_config', lambda: json.loads(json.dumps(stuff.config)))
+  monkeypatch.setattr(dcaeapplib, '_httpport', 0)
+  env = dcaeapplib.DcaeEnv()
+  fail = []
+  def stub_get(session, url, **kwargs):
+    if fail:
+      raise requests.exceptions.ConnectionError('down')
+    return stuff
+  def stub_post(session, url, data, **kwargs):
+    return stuff
+  monkeypatch.setattr(requests.Session, 'get', stub_get)
+  monkeypatch.setattr(requests.Session, 'post', stub_post)
+  stuff.toreturn = [ 'r1', 'r2', 'r3' ]
+  assert env.getdata('myinputstream') == 'r1'
+  stuff.toreturn = []
+  assert env.getbatch('myinputstream', 2) == [ 'r2', 'r3' ]
+  assert env.getdata('myinputstream') is None
+  fail.append(1)
+  try:
+    env.getdata('myinputstream')
+    assert False
+  except requests.exceptions.ConnectionError:
+    pass
+  env.senddata_batch('myoutputstream', [ ('k', 'a'), ('k', 'b') ])
+  env.senddata('myoutputstream', 'k', 'c')
+  # counters add up the updates of all threads
+  threads = [ threading.Thread(target=lambda: [ env._m_consumed('other').inc() for i in range(1000) ]) for j in range(4) ]
+  for th in threads:
+    th.start()
+  for th in threads:
+    th.join()
+  # the cells of threads that have ended are folded into a base total
+  for j in range(50):
+    th = threading.Thread(target=lambda: env._m_consumed('short').inc())
+    th.start()
+    th.join()
+  assert len(env._m_consumed('short')._cells._cells) == 1
+  assert env._m_consumed('short').value() == 50
+  assert env._m_consumed('short')._cells._cells == []
+  env.start()
+  try:
+    env._reconfigurer.request()
+    assert env._reconfigurer.wait(5)
+    resp = requests.get('http://localhost:{0}/metrics'.format(env._server.server_port), timeout=2)
+  finally:
+    env.stop()
+  assert resp.status_code == 200
+  assert resp.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+  lines = resp.text.splitlines()
+  assert 'dcae_records_consumed_total{stream="myinputstream"} 3' in lines
+  assert 'dcae_records_consumed_total{stream="other"} 4000' in lines
+  assert 'dcae_bytes_consumed_total{stream="myinputstream"} 18' in lines
+  assert 'dcae_empty_polls_total{stream="myinputstream"} 1' in lines
+  assert 'dcae_poll_duration_seconds_count{stream="myinputstream"} 2' in lines
+  assert 'dcae_poll_duration_seconds_bucket{stream="myinputstream",le="+Inf"} 2' in lines
+  assert 'dcae_http_errors_total{stream="myinputstream",operation="poll"} 1' in lines
+  assert 'dcae_records_published_total{stream="myoutputstream"} 3' in lines
+  assert 'dcae_unread_records{stream="myinputstream"} 0' in lines
+  assert 'dcae_reconfigure_duration_seconds_count 1' in lines
+  assert '# TYPE dcae_poll_duration_seconds histogram' in lines
+
+def test_adaptive(monkeypatch):
+  stuff = Stubs()
+  monkeypatch.setattr(dcaeapplib, 'get_config', lambda: json.loads(json.dumps(stuff.config)))
+  env = dcaeapplib.DcaeEnv()
+  polls = []
+  available = [ 1000 ]
+  def stub_get(session, url, **kwargs):
+    query = dict([ kv.split('=') for kv in url.split('?')[1].split('&') ])
+    polls.append((int(query['timeout']), int(query['limit'])))
+    stuff.toreturn = [ 'r' ] * min(available[0], int(query['limit']))
+    available[0] -= len(stuff.toreturn)
+    return stuff
+  monkeypatch.setattr(requests.Session, 'get', stub_get)
+  env.adaptive('myinputstream', minlimit=2, maxlimit=16, mintimeout_ms=50, maxtimeout_ms=5000)
+  # full polls: the limit doubles up to maxlimit, and the caller's limit is ignored
+  for i in range(5):
+    env.getbatch('myinputstream', 100, timeout_ms=10000, limit=1)
+  assert [ limit for timeout, limit in polls ] == [ 2, 4, 8, 16, 16 ]
+  # no timeout beyond the caller's, and a busy stream gets short timeouts
+  assert polls[0][0] == 5000
+  assert polls[-1][0] == 50
+  # empty polls: the limit halves down to minlimit, and the timeout grows back
+  available[0] = 0
+  for i in range(8):
+    env.getbatch('myinputstream', 100, timeout_ms=1000)
+  assert polls[-1] == (1000, 2)
+  tuner = env._tuners['myinputstream']
+  assert tuner.limit == 2 and tuner.timeout_ms == 5000
+  # records beyond what was asked for are kept for later
+  available[0] = 1000
+  assert env.getdata('myinputstream') == 'r'
+  assert env.hasdata('myinputstream')
+
+def _take(it, count, timeout):
+  """
+  Return up to count items of it, giving up after timeout seconds, so a consumer that blocks fails the test
+  """
+  got = []
+  def run():
+    for item in it:
+      got.append(item)
+      if len(got) == count:
+        return
+  th = threading.Thread(target=run)
+  th.daemon = True
+  th.start()
+  th.join(timeout)
+  assert not th.is_alive(), 'gave up after {0} items'.format(len(got))
+  return got
+
+def test_consume(monkeypatch):
+  stuff = Stubs()
+  stuff.config['streams_subscribes']['busy'] = { 'dmaap_info': { 'topic_url': 'http://messagerouter.example.com:3904/events/busy' } }
+  stuff.config['streams_subscribes']['idle'] = { 'dmaap_info': { 'topic_url': 'http://messagerouter.example.com:3904/events/idle' } }
+  monkeypatch.setattr(dcaeapplib, 'get_config', lambda: json.loads(json.dumps(stuff.config)))
+  env = dcaeapplib.DcaeEnv()
+  topics = { '/events/busy/': 'busy', '/events/idle/': 'idle', '/events/topic1/': 'myinputstream' }
+  counts = { 'busy': 0, 'idle': 0, 'myinputstream': 0 }
+  released = threading.Event()
+  class Resp:
+    def __init__(self, records):
+      self.records = records
+    def raise_for_status(self):
+      if self.records == 'fail':
+        raise requests.exceptions.HTTPError('503')
+    def json(self):
+      return self.records
+    @property
+    def content(self):
+      return json.dumps(self.records).encode('utf-8')
+  def stub_get(session, url, **kwargs):
+    name = [ stream for topic, stream in topics.items() if topic in url ][0]
+    counts[name] += 1
+    if name == 'idle' and counts[name] == 1:
+      return Resp('fail')
+    if name == 'idle' or counts[name] > 3:
+      # a long poll that returns nothing
+      released.wait(5)
+      return Resp([])
+    return Resp([ '{0}{1}'.format(name, counts[name]) ] * 4)
+  monkeypatch.setattr(requests.Session, 'get', stub_get)
+  try:
+    for stream in ('busy', 'idle', 'myinputstream'):
+      env.prefetch(stream, timeout_ms=100, limit=4)
+    deadline = time.time() + 5
+    while (counts['idle'] < 1 or min([ len(env._unread[stream].records) for stream in ('busy', 'myinputstream') ]) < 12) and time.time() < deadline:
+      time.sleep(0.01)
+    errors = []
+    it = env.consume(quantum=2, timeout_ms=100, limit=4, errorCB=lambda stream, error: errors.append(stream))
+    # waiting consumers are registered only while iterating
+    assert env._unread['busy'].events == []
+    # the idle stream does not delay the others, and they are served in turn
+    got = _take(it, 24, 4)
+    assert [ stream for stream, record in got ] == [ 'busy', 'busy', 'myinputstream', 'myinputstream' ] * 6
+    assert [ record for stream, record in got if stream == 'busy' ] == [ 'busy{0}'.format(i // 4 + 1) for i in range(12) ]
+    # the failed poll of the idle stream is reported once, and polling goes on
+    assert errors == [ 'idle' ]
+    deadline = time.time() + 5
+    while counts['idle'] < 2 and time.time() < deadline:
+      time.sleep(0.01)
+    assert counts['idle'] == 2
+    it.close()
+    assert env._unread['busy'].events == []
+    # the iterator ends once the DcaeEnv is closed
+    it = env.consume([ 'idle' ])
+    released.set()
+    env.close()
+    assert _take(it, 1, 5) == []
+  finally:
+    released.set()
+    env.close()
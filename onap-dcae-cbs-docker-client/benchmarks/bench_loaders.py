@@ -0,0 +1,132 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+"""
+Compare the loaders available for application_config.yaml on a large generated config.
+
+    python benchmarks/bench_loaders.py --size-mb 5 --repeat 3
+"""
+
+import argparse
+import json
+import os
+import time
+
+import yaml
+
+from onap_dcae_cbs_docker_client import client
+
+
+def generate_config(size_bytes, placeholder_every=0):
+    """
+    Build a collector-like configuration whose JSON form is roughly size_bytes long.
+    With placeholder_every=n, the topic of every nth rule is a ${BENCH_TOPIC} reference.
+    """
+    config = {
+        "collector.service.port": 8080,
+        "streams_subscribes": {},
+        "streams_publishes": {},
+        "rules": [],
+    }
+    size = len(json.dumps(config))
+    i = 0
+    while size < size_bytes:
+        for j in range(100):
+            n = i * 100 + j
+            rule = {
+                "name": "rule-{0}".format(n),
+                "enabled": n % 2 == 0,
+                "threshold": n * 1.5,
+                "fields": ["$.event.field{0}".format(k) for k in range(5)],
+                "target": {"topic": "TOPIC_{0}".format(n % 17), "partition": str(n % 3)},
+            }
+            if placeholder_every and n % placeholder_every == 0:
+                rule["target"]["topic"] = "${BENCH_TOPIC}_" + str(n)
+            config["rules"].append(rule)
+            size += len(json.dumps(rule)) + 2
+            if size >= size_bytes:
+                break
+        stream = {
+            "type": "message_router",
+            "dmaap_info": {"topic_url": "http://message-router:3904/events/TOPIC_{0}".format(i)},
+        }
+        config["streams_publishes"]["stream-{0}".format(i)] = stream
+        size += len(json.dumps(stream)) + 16
+        i += 1
+    return config
+
+
+def generate_policies(count):
+    """
+    Build a policy file, in the format written by policy-sync, with count policies
+    """
+    items = [
+        {
+            "policyName": "onap.bench.policy.{0}.1.xml".format(n),
+            "name": "onap.bench.policy.{0}".format(n),
+            "version": "1.0.0",
+            "metadata": {"policy-id": "onap.bench.policy.{0}".format(n), "policy-version": 1},
+            "config": {"threshold": n, "direction": "LESS_OR_EQUAL", "closedLoopControlName": "ControlLoop-{0}".format(n)},
+        }
+        for n in range(count)
+    ]
+    return {"policies": {"items": items, "event": {"action": "gathered", "timestamp": "2026-10-18T00:00:00Z"}}}
+
+
+def _time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=2.0, help="approximate size of the generated config")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per loader; the best is reported")
+    args = parser.parse_args()
+
+    config = generate_config(int(args.size_mb * 1024 * 1024))
+    yaml_text = yaml.dump(config, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper))
+    json_text = json.dumps(config)
+    print("generated {0:.1f} MB of YAML, {1:.1f} MB of JSON".format(len(yaml_text) / 1e6, len(json_text) / 1e6))
+
+    loaders = [("yaml.SafeLoader, YAML", lambda: yaml.load(yaml_text, Loader=yaml.SafeLoader))]
+    if hasattr(yaml, "CSafeLoader"):
+        loaders.append(("yaml.CSafeLoader, YAML", lambda: yaml.load(yaml_text, Loader=yaml.CSafeLoader)))
+        loaders.append(("yaml.CSafeLoader, JSON", lambda: yaml.load(json_text, Loader=yaml.CSafeLoader)))
+    else:
+        print("PyYAML was built without libyaml; CSafeLoader is not available")
+    loaders.append(("client._parse_config, YAML", lambda: client._parse_config(yaml_text)))
+
+    def _json_fast_path():
+        os.environ["CBS_CLIENT_JSON_FAST_PATH"] = "true"
+        try:
+            client._parse_config(json_text)
+        finally:
+            del os.environ["CBS_CLIENT_JSON_FAST_PATH"]
+
+    loaders.append(("client._parse_config, JSON fast path", _json_fast_path))
+
+    for name, fn in loaders:
+        print("{0:<40} {1:8.3f} s".format(name, _time(fn, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
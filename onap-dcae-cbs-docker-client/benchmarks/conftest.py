@@ -0,0 +1,162 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+
+"""
+fixtures for the pytest-benchmark suite: generated configs, and a stub CBS to fetch them from
+
+    pytest benchmarks --config-sizes 1KB,1MB
+"""
+
+import functools
+import http.server
+import json
+import re
+import threading
+import tracemalloc
+
+import pytest
+import yaml
+
+from onap_dcae_cbs_docker_client import client
+from onap_dcae_cbs_docker_client.client import clear_cache, close_session
+
+from bench_loaders import generate_config, generate_policies
+
+_UNITS = {"": 1, "KB": 1024, "MB": 1024 * 1024}
+
+
+def parse_size(text):
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*(KB|MB|)\s*", text.upper())
+    if match is None:
+        raise ValueError("Invalid config size '{0}', expected e.g. 100KB or 5MB".format(text))
+    return int(float(match.group(1)) * _UNITS[match.group(2)])
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--config-sizes",
+        default="1KB,100KB,1MB,10MB,50MB",
+        help="comma separated sizes of the generated configs (default: 1KB,100KB,1MB,10MB,50MB)",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "config_size" in metafunc.fixturenames:
+        sizes = metafunc.config.getoption("--config-sizes").split(",")
+        metafunc.parametrize("config_size", [parse_size(size) for size in sizes], ids=[size.strip() for size in sizes])
+
+
+@functools.lru_cache(maxsize=None)
+def cached_config(size, placeholder_every=0):
+    """
+    The generated configs are shared by all the benchmarks; treat them as read-only
+    """
+    return generate_config(size, placeholder_every)
+
+
+@functools.lru_cache(maxsize=None)
+def cached_policies(count):
+    return generate_policies(count)
+
+
+def dump(document, fmt):
+    if fmt == "json":
+        return json.dumps(document)
+    return yaml.dump(document, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper))
+
+
+def run(benchmark, fn, size=0):
+    """
+    Time fn with fewer rounds for the big configs, and record its peak Python memory use
+    from one extra, untimed, call in benchmark.extra_info["peak_memory_bytes"]
+    """
+    tracemalloc.start()
+    try:
+        fn()
+        benchmark.extra_info["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    rounds = 3 if size >= 10 * 1024 * 1024 else 10 if size >= 1024 * 1024 else 50
+    return benchmark.pedantic(fn, rounds=rounds, warmup_rounds=1)
+
+
+@pytest.fixture(autouse=True)
+def bench_env(monkeypatch, tmp_path):
+    """
+    no local files, no caching, and a fresh CBS connection pool for every benchmark
+    """
+    monkeypatch.setenv("HOSTNAME", "bench")
+    monkeypatch.setenv("CONFIG_BINDING_SERVICE", "config-binding-service")
+    monkeypatch.setenv("BENCH_TOPIC", "BENCH_TOPIC")
+    monkeypatch.setenv("CBS_CLIENT_CONFIG_PATH", str(tmp_path / "missing.yaml"))
+    monkeypatch.setenv("CBS_CLIENT_POLICY_PATH", str(tmp_path / "missing.json"))
+    for name in ("CBS_CLIENT_CACHE_TTL", "CBS_CLIENT_JSON_FAST_PATH", "CBS_CLIENT_SNAPSHOT_DIR", "CBS_CLIENT_RETRY_MAX_ELAPSED", "CBS_CLIENT_BREAKER_THRESHOLD"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(client.logger, "level", 20)  # INFO: keep the debug log of each fetch out of the timings
+    clear_cache()
+    close_session()
+    yield
+    clear_cache()
+    close_session()
+
+
+class _StubCBSHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # the headers and the body are separate writes: without this, small responses wait for a delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = self.server.documents.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="session")
+def stub_cbs():
+    """
+    A local HTTP server answering for the CBS; set stub_cbs.documents["/<path>/bench"] to the body to serve
+    """
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _StubCBSHandler)
+    server.daemon_threads = True
+    server.documents = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cbs(stub_cbs, monkeypatch):
+    """
+    Point the client at the stub CBS
+    """
+    port = stub_cbs.server_address[1]
+    monkeypatch.setattr(client, "_get_endpoint", lambda path: ("http://127.0.0.1:{0}/{1}/bench".format(port, path), None))
+    stub_cbs.documents.clear()
+    return stub_cbs
@@ -0,0 +1,80 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+
+"""
+pytest-benchmark suite for the paths through which get_config() and get_all() load a configuration
+
+    pip install pytest-benchmark
+    pytest benchmarks --config-sizes 1KB,100KB,1MB,10MB,50MB
+
+Each benchmark also records the peak Python memory use of one call as extra_info["peak_memory_bytes"].
+"""
+
+import json
+
+import pytest
+
+from onap_dcae_cbs_docker_client import client
+from onap_dcae_cbs_docker_client.client import get_all, get_config
+
+from conftest import cached_config, cached_policies, dump, run
+
+
+@pytest.mark.parametrize("fmt", ["yaml", "json"])
+def test_config_file(benchmark, monkeypatch, tmp_path, config_size, fmt):
+    """
+    get_config() from the local config file; JSON is read with the JSON fast path
+    """
+    config_file = tmp_path / "application_config.{0}".format(fmt)
+    config_file.write_text(dump(cached_config(config_size), fmt))
+    monkeypatch.setenv("CBS_CLIENT_CONFIG_PATH", str(config_file))
+    if fmt == "json":
+        monkeypatch.setenv("CBS_CLIENT_JSON_FAST_PATH", "true")
+    benchmark.extra_info["file_bytes"] = config_file.stat().st_size
+    assert run(benchmark, get_config, config_size)
+
+
+@pytest.mark.parametrize("placeholder_every", [0, 100, 1], ids=["none", "sparse", "dense"])
+def test_recurse(benchmark, config_size, placeholder_every):
+    """
+    ${VAR} substitution of an already parsed config
+    """
+    config = cached_config(config_size, placeholder_every)
+    assert run(benchmark, lambda: client._recurse(config), config_size)
+
+
+def test_rest_fallback(benchmark, cbs, config_size):
+    """
+    get_config() from the CBS, over a pooled keep-alive connection
+    """
+    cbs.documents["/service_component/bench"] = json.dumps(cached_config(config_size)).encode("utf-8")
+    assert run(benchmark, get_config, config_size)
+
+
+@pytest.mark.parametrize("policy_count", [10, 1000, 10000])
+def test_policy_file(benchmark, monkeypatch, tmp_path, policy_count):
+    """
+    get_all() from the local files, reading all the policies
+    """
+    config_file = tmp_path / "application_config.yaml"
+    config_file.write_text(dump(cached_config(1024), "yaml"))
+    policy_file = tmp_path / "policies.json"
+    policy_file.write_text(json.dumps(cached_policies(policy_count)))
+    monkeypatch.setenv("CBS_CLIENT_CONFIG_PATH", str(config_file))
+    monkeypatch.setenv("CBS_CLIENT_POLICY_PATH", str(policy_file))
+    benchmark.extra_info["file_bytes"] = policy_file.stat().st_size
+    assert run(benchmark, lambda: get_all()["policies"], policy_file.stat().st_size)
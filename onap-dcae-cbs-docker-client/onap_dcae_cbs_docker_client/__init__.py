@@ -15,17 +15,74 @@
 # ============LICENSE_END=========================================================
 #
 # ECOMP is a trademark and service mark of AT&T Intellectual Property.
+import json
 import logging
+import os
+
+_TEXT_FORMAT = "%(asctime)s [%(name)-12s] %(levelname)-8s %(message)s"
+
+# the attributes every LogRecord has; anything else was passed in extra= and goes into JSON records
+_RECORD_ATTRIBUTES = frozenset(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats each record as a one line JSON object, with the fields given in extra= added to it
+    """
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class LazyJSON:
+    """
+    Logging argument that only serializes obj to JSON if the record is actually emitted:
+    logger.debug("config: %s", LazyJSON(config))
+    """
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __str__(self):
+        return json.dumps(self.obj)
+
+
+def _get_level():
+    name = os.environ.get("CBS_CLIENT_LOG_LEVEL", "DEBUG")
+    level = logging.getLevelName(name.upper())
+    return level if isinstance(level, int) else logging.DEBUG
 
 
 def get_module_logger(mod_name):
     """
     To use this, do logger = get_module_logger(__name__)
+
+    The handler is only attached the first time a logger is asked for, so calling this
+    again never duplicates the output. $CBS_CLIENT_LOG_LEVEL sets the level (default DEBUG),
+    and $CBS_CLIENT_LOG_FORMAT=json writes structured JSON records instead of text.
     """
     logger = logging.getLogger(mod_name)
+    if any(getattr(handler, "_cbs_client_handler", False) for handler in logger.handlers):
+        return logger
     handler = logging.StreamHandler()
-    formatter = logging.Formatter("%(asctime)s [%(name)-12s] %(levelname)-8s %(message)s")
-    handler.setFormatter(formatter)
+    handler._cbs_client_handler = True
+    if os.environ.get("CBS_CLIENT_LOG_FORMAT", "").lower() == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(_TEXT_FORMAT))
     logger.addHandler(handler)
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(_get_level())
     return logger
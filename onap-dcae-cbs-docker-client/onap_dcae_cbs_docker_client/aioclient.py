@@ -0,0 +1,147 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+"""
+asyncio version of the client
+
+get_config() and get_all() behave like their counterparts in the client module:
+the local files are tried first, then the CBS, and the same exceptions are raised.
+Needs aiohttp, e.g. pip install onap_dcae_cbs_docker_client[async]
+"""
+
+import asyncio
+import json
+import ssl
+import weakref
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from onap_dcae_cbs_docker_client import get_module_logger
+from onap_dcae_cbs_docker_client import client
+from onap_dcae_cbs_docker_client.envsubst import Template
+from onap_dcae_cbs_docker_client.exceptions import CantGetConfig, CBSUnreachable
+
+logger = get_module_logger(__name__)
+
+# an aiohttp session belongs to the event loop it was created on
+_sessions = weakref.WeakKeyDictionary()
+_ssl_contexts = {}
+
+
+def _get_session():
+    """
+    Return the keep-alive session shared by all tasks on the running event loop.
+    It honours the same $CBS_CLIENT_POOL_SIZE and timeout settings as the blocking client.
+    """
+    if aiohttp is None:
+        raise ImportError("the asyncio CBS client needs aiohttp: pip install onap_dcae_cbs_docker_client[async]")
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        connect_timeout, read_timeout = client._get_timeout()
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=client._env_number("CBS_CLIENT_POOL_SIZE", client.DEFAULT_POOL_SIZE, int)),
+            timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+        )
+        _sessions[loop] = session
+    return session
+
+
+def _get_ssl_context(cacert):
+    context = _ssl_contexts.get(cacert)
+    if context is None:
+        context = _ssl_contexts[cacert] = ssl.create_default_context(cafile=cacert)
+    return context
+
+
+async def _get_path(path):
+    """
+    Try to get the config, and return appropriate exceptions otherwise
+    """
+    my_config_endpoint, https_cacert = client._get_endpoint(path)
+    session = _get_session()
+    kwargs = {}
+    if https_cacert:
+        kwargs["ssl"] = _get_ssl_context(https_cacert)
+    try:
+        async with session.get(my_config_endpoint, **kwargs) as res:
+            text = await res.text()
+            if res.status >= 400:
+                logger.error(
+                    "The config binding service endpoint %s returned a bad status. code: %d, text: %s",
+                    my_config_endpoint,
+                    res.status,
+                    text,
+                )
+                raise CantGetConfig(res.status, text)
+    except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+        # this is thrown if we cant even connect to the endpoint, or it stops answering
+        raise CBSUnreachable(e)
+
+    config = json.loads(text)
+    logger.debug(
+        "get_config returned the following configuration: %s using the config url %s",
+        text,
+        my_config_endpoint,
+    )
+    return config
+
+
+async def _load(cbs_path, from_cbs, from_files, *args):
+    # the files are read and parsed on the loop's default executor, so the loop never blocks on disk
+    template = await asyncio.get_running_loop().run_in_executor(None, from_files, *args)
+    if template is client._NOT_FOUND:
+        logger.debug("Fallback to using REST call")
+        template = from_cbs(await _get_path(cbs_path))
+    return client._render((cbs_path,) + args + (client._env_flag("CBS_CLIENT_FROZEN"),), template)
+
+
+#########
+# Public
+async def close_session():
+    """
+    Close the pooled CBS connections of the running event loop
+    """
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+async def get_all():
+    """
+    If not configured locally,
+    hit the CBS service_component_all endpoint
+
+    Local configuration comes from $CBS_CLIENT_CONFIG_PATH and $CBS_CLIENT_POLICY_PATH,
+    defaulted to /app-config/application_config.yaml and /etc/policies/policies.json.
+
+    Like client.get_all(), returns a policies.AllConfig if $CBS_CLIENT_LAZY_POLICIES is set.
+    """
+    return await _load("service_component_all", client._all_from_cbs, client._all_from_files, client._get_config_path(), client._get_policy_path())
+
+
+async def get_config():
+    """
+    If not configured locally,
+    hit the CBS service_component endpoint for the configuration.
+
+    Local configuration comes from $CBS_CLIENT_CONFIG_PATH,
+    defaulted to /app-config/application_config.yaml.
+    """
+    return await _load("service_component", Template, client._config_from_file, client._get_config_path())
@@ -17,13 +17,25 @@
 
 """ provide a means to return a configuration to CBS """
 
+import collections
 import json
 import os
 import requests
 import sys
+import threading
+import time
 import yaml
 
-from onap_dcae_cbs_docker_client import get_module_logger
+from requests.adapters import HTTPAdapter
+
+from onap_dcae_cbs_docker_client import get_module_logger, LazyJSON
+from onap_dcae_cbs_docker_client import jsonscan
+from onap_dcae_cbs_docker_client import snapshot
+from onap_dcae_cbs_docker_client.frozen import freeze
+from onap_dcae_cbs_docker_client.envsubst import Template, substitute
+from onap_dcae_cbs_docker_client.policies import AllTemplate, PolicyFile
+from onap_dcae_cbs_docker_client.retry import CircuitBreaker, retry_call
+from onap_dcae_cbs_docker_client.singleflight import SingleFlight
 from onap_dcae_cbs_docker_client.exceptions import ENVsMissing, CantGetConfig, CBSUnreachable
 
 logger = get_module_logger(__name__)
@@ -32,6 +44,63 @@ logger = get_module_logger(__name__)
 DEFAULT_CONFIG_PATH = "/app-config/application_config.yaml"
 DEFAULT_POLICY_PATH = "/etc/policies/policies.json"
 
+# Connection pool settings for the CBS REST fallback.
+# Each may be overridden with $CBS_CLIENT_POOL_SIZE, $CBS_CLIENT_CONNECT_TIMEOUT
+# and $CBS_CLIENT_READ_TIMEOUT (timeouts are in seconds).
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+
+# Retries of failed CBS requests, off unless $CBS_CLIENT_RETRY_MAX_ELAPSED is set to a number of seconds.
+# The backoff may be tuned with $CBS_CLIENT_RETRY_BASE_DELAY and $CBS_CLIENT_RETRY_MAX_DELAY.
+DEFAULT_RETRY_BASE_DELAY = 0.5
+DEFAULT_RETRY_MAX_DELAY = 30.0
+
+# The circuit breaker opens after $CBS_CLIENT_BREAKER_THRESHOLD consecutive failed requests
+# (off unless set), and lets a request through again after $CBS_CLIENT_BREAKER_RESET seconds.
+# While it is open, the last configuration successfully fetched from the CBS is returned instead.
+DEFAULT_BREAKER_RESET = 30.0
+
+_breaker = CircuitBreaker()
+_last_good = {}
+
+# Each configuration fetched from the CBS is also saved to $CBS_CLIENT_SNAPSHOT_DIR, when set.
+# With $CBS_CLIENT_SNAPSHOT_PRELOAD, the first fetch of the process returns the saved snapshot
+# straight away and refreshes it from the CBS in the background.
+_preloaded = set()
+_preload_lock = threading.Lock()
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+# Opt-in cache of loaded configurations, enabled by setting $CBS_CLIENT_CACHE_TTL
+# to a number of seconds. Entries are keyed on the CBS endpoint and the local file paths.
+_CacheEntry = collections.namedtuple("_CacheEntry", ["value", "template", "stamp", "expires", "from_cbs", "etag"])
+_cache = {}
+_cache_lock = threading.Lock()
+
+# With $CBS_CLIENT_FROZEN set, configurations are returned deeply frozen (see the frozen module),
+# sharing their unchanged sub-trees with the previous version returned for the same key.
+_last_frozen = {}
+
+# With $CBS_CLIENT_SINGLE_FLIGHT set, threads loading the same configuration at the same time
+# share a single read of the files, or request to the CBS, and its result.
+_flights = SingleFlight()
+
+# get_config_subtree() remembers each subtree it read from the local config file, keyed on
+# the file and the subtree path, along with the version (_file_stamps) of the file it came from.
+# The whole parsed document is kept under the None subtree path when it had to be parsed.
+_subtrees = {}
+_subtrees_lock = threading.Lock()
+_NO_SUBTREE = object()
+
+# returned by the local file readers when the CBS must be asked instead
+_NOT_FOUND = object()
+
+# libyaml's loader is many times faster than the pure-Python one; use it when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 # provide a means to import the default paths into unit tests
 # For some reason, tox does not like
@@ -50,27 +119,74 @@ def default_policy_path():
 
 def _recurse(config):
     """
-    Recurse through a configuration, or recursively a sub element of it.
-    If it's a dict: recurse over all the values
-    If it's a list: recurse over all the values
-    If it's a string: expand the string and return its replacement
-    If none of the above, just return the item.
-    """
-    if isinstance(config, list):
-        return [_recurse(item) for item in config]
-    if isinstance(config, dict):
-        for key in config:
-            config[key] = _recurse(config[key])
-        return config
-    if isinstance(config, str):
-        return change_envs(config)
-    # not a dict, not a list, not a string, nothing to do.
-    return config
+    Expand the ${VAR} references throughout a configuration, or a sub element of it,
+    and return the expanded copy. See the envsubst module.
+    """
+    return substitute(config)
 
 
-def _get_path(path):
+def _env_number(name, default, cast=float):
     """
-    Try to get the config, and return appropriate exceptions otherwise
+    Return the numeric value of an ENV variable, or the default if it is unset, empty or malformed
+    """
+    value = os.getenv(name, "")
+    if value == "":
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        logger.error(f"Ignoring invalid value '{value}' for ENV Variable {name}")
+        return default
+
+
+def _env_flag(name):
+    """
+    Return whether an ENV variable is set to a true value
+    """
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+
+def _get_session():
+    """
+    Return the process-wide keep-alive session used to talk to the CBS.
+
+    The session is created on first use and shared by all threads; its urllib3
+    connection pool is thread-safe. Reusing pooled connections means repeated
+    fetches pay for the TCP (and, with $DCAE_CA_CERTPATH, TLS) handshake once.
+    A forked child builds its own session rather than sharing sockets with its parent.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    session = _session
+    if session is not None and _session_pid == pid:
+        return session
+
+    with _session_lock:
+        if _session is None or _session_pid != pid:
+            pool_size = _env_number("CBS_CLIENT_POOL_SIZE", DEFAULT_POOL_SIZE, int)
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+            _session_pid = pid
+        return _session
+
+
+def _get_timeout():
+    """
+    Return the (connect, read) timeout tuple used for CBS requests
+    """
+    return (
+        _env_number("CBS_CLIENT_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT),
+        _env_number("CBS_CLIENT_READ_TIMEOUT", DEFAULT_READ_TIMEOUT),
+    )
+
+
+def _get_endpoint(path):
+    """
+    Return the URL of this component's path endpoint on the CBS, and the cacert
+    to verify the CBS with (None if it is not using https)
     """
     try:
         hostname = os.environ["HOSTNAME"]  # this is the name of the component itself
@@ -85,19 +201,36 @@ def _get_path(path):
 
     # Get the CBS URL.
     cbs_url = "https://{0}:10443".format(cbs_name) if https_cacert else "http://{0}:10000".format(cbs_name)
+    return "{0}/{1}/{2}".format(cbs_url, path, hostname), https_cacert
+
+
+def _fetch_once(path, etag=None):
+    """
+    Try to get the config, and return appropriate exceptions otherwise.
+    Returns a (config, etag) tuple. If an etag is given and the CBS answers
+    304 Not Modified, config is None.
+    """
+    my_config_endpoint, https_cacert = _get_endpoint(path)
 
     # get my config
     try:
-        my_config_endpoint = "{0}/{1}/{2}".format(cbs_url, path, hostname)
-        res = requests.get(my_config_endpoint, verify=https_cacert) if https_cacert else requests.get(my_config_endpoint)
+        kwargs = {"timeout": _get_timeout()}
+        if https_cacert:
+            kwargs["verify"] = https_cacert
+        if etag:
+            kwargs["headers"] = {"If-None-Match": etag}
+        res = _get_session().get(my_config_endpoint, **kwargs)
+        if etag and res.status_code == 304:
+            logger.debug("get_config configuration at %s is unchanged", my_config_endpoint)
+            return None, etag
         res.raise_for_status()
         config = res.json()
         logger.debug(
             "get_config returned the following configuration: %s using the config url %s",
-            json.dumps(config),
+            LazyJSON(config),
             my_config_endpoint,
         )
-        return config
+        return config, res.headers.get("ETag")
     except requests.exceptions.HTTPError:  # this is thrown by raise_for_status
         logger.error(
             "The config binding service endpoint %s returned a bad status. code: %d, text: %s",
@@ -106,78 +239,167 @@ def _get_path(path):
             res.text,
         )
         raise CantGetConfig(res.status_code, res.text)
-    except requests.exceptions.ConnectionError as e:  # this is thrown if requests.get cant even connect to the endpoint
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        # this is thrown if we cant even connect to the endpoint, or it stops answering
         raise CBSUnreachable(e)
 
 
-def change_envs(value):
+def _is_cbs_down(e):
     """
-    Replace env reference by actual value and return it
+    Is the exception a sign that the CBS is (temporarily) unavailable?
     """
-    if value.startswith('${'):
-        name = value[2:-1]
-        if name in os.environ:
-            return os.environ[name]
+    return isinstance(e, CBSUnreachable) or (isinstance(e, CantGetConfig) and e.code >= 500)
 
-        logger.error(f"Required ENV Variable '{name}' missing. Is '{value}' properly formatted?")
-        raise ENVsMissing(f"Required ENV Variable {name} missing. Is '{value}' properly formatted?")
-    return value
 
+def _snapshot_name(path):
+    return "{0}-{1}".format(path, os.environ.get("HOSTNAME", ""))
 
-#########
-# Public
-def get_all():
+
+def _save_snapshot(path, result):
+    directory = os.getenv("CBS_CLIENT_SNAPSHOT_DIR", "")
+    if directory:
+        snapshot.save(directory, _snapshot_name(path), *result)
+
+
+def _load_snapshot(path):
+    directory = os.getenv("CBS_CLIENT_SNAPSHOT_DIR", "")
+    return snapshot.load(directory, _snapshot_name(path)) if directory else None
+
+
+def _refresh_snapshot(path):
+    try:
+        _fetch(path)
+    except Exception as e:
+        logger.error(f"Could not refresh the configuration snapshot for {path} from the config binding service: {e}")
+
+
+def _preload_snapshot(path):
     """
-    If not configured locally,
-    hit the CBS service_component_all endpoint
+    On the first fetch of path in this process, return its snapshot (if any) and refresh it in the background
+    """
+    if not _env_flag("CBS_CLIENT_SNAPSHOT_PRELOAD"):
+        return None
+    with _preload_lock:
+        if path in _preloaded:
+            return None
+        _preloaded.add(path)
+    result = _load_snapshot(path)
+    if result is not None:
+        logger.debug(f"Returning the configuration snapshot for {path}, refreshing it in the background")
+        th = threading.Thread(target=_refresh_snapshot, args=(path,), name="cbs-snapshot-refresh")
+        th.daemon = True
+        th.start()
+    return result
+
+
+def _last_known_good(path, error):
+    result = _last_good.get(path) or _load_snapshot(path)
+    if result is None:
+        raise error
+    logger.warning(f"The config binding service is unavailable, using the last configuration fetched from {path}")
+    return result
+
+
+def _fetch(path, etag=None):
+    """
+    _fetch_once(), retried while the CBS is unavailable and guarded by the circuit breaker,
+    as configured by $CBS_CLIENT_RETRY_* and $CBS_CLIENT_BREAKER_*, and saved to
+    (or preloaded from) a snapshot as configured by $CBS_CLIENT_SNAPSHOT_*.
+    """
+    if etag is None:
+        result = _preload_snapshot(path)
+        if result is not None:
+            return result
 
-    Local configuration comes from $CBS_CLIENT_CONFIG_PATH and $CBS_CLIENT_POLICY_PATH,
-    defaulted to /app-config/application_config.yaml and /etc/policies/policies.json.
+    threshold = _env_number("CBS_CLIENT_BREAKER_THRESHOLD", 0, int)
+    if threshold > 0 and not _breaker.allow(_env_number("CBS_CLIENT_BREAKER_RESET", DEFAULT_BREAKER_RESET)):
+        return _last_known_good(path, CBSUnreachable("The circuit breaker for the config binding service is open"))
+
+    try:
+        max_elapsed = _env_number("CBS_CLIENT_RETRY_MAX_ELAPSED", 0)
+        if max_elapsed > 0:
+            result = retry_call(
+                lambda: _fetch_once(path, etag),
+                _is_cbs_down,
+                max_elapsed,
+                _env_number("CBS_CLIENT_RETRY_BASE_DELAY", DEFAULT_RETRY_BASE_DELAY),
+                _env_number("CBS_CLIENT_RETRY_MAX_DELAY", DEFAULT_RETRY_MAX_DELAY),
+            )
+        else:
+            result = _fetch_once(path, etag)
+    except Exception as e:
+        # whatever the outcome, it must be recorded, or a trial request would leave the breaker open for good
+        if threshold > 0 and _is_cbs_down(e):
+            _breaker.record_failure(threshold)
+            if _breaker.is_open:
+                return _last_known_good(path, e)
+        else:
+            _breaker.record_success()
+        raise
+
+    _breaker.record_success()
+    if result[0] is not None:
+        _last_good[path] = result
+        _save_snapshot(path, result)
+    return result
+
+
+def _get_path(path):
+    """
+    Try to get the config, and return appropriate exceptions otherwise
+    """
+    return _fetch(path)[0]
+
+
+def change_envs(value):
     """
+    Replace env references by actual values and return the result
+    """
+    return substitute(value)
+
+
+def _get_config_path():
     config_path = os.getenv("CBS_CLIENT_CONFIG_PATH", DEFAULT_CONFIG_PATH)
     if config_path == "":
         config_path = DEFAULT_CONFIG_PATH
+    return config_path
+
+
+def _get_policy_path():
     policy_path = os.getenv("CBS_CLIENT_POLICY_PATH", DEFAULT_POLICY_PATH)
     if policy_path == "":
         policy_path = DEFAULT_POLICY_PATH
+    return policy_path
+
 
+def _parse_config(stream):
+    """
+    Parse the text of a configuration file, given as a string, bytes or an open file.
+
+    If $CBS_CLIENT_JSON_FAST_PATH is set, a document that looks like JSON is first
+    handed to the json module, which is much faster than any YAML loader.
+    It is opt-in because YAML 1.1 reads a few JSON scalars (e.g. 1e3) differently.
+    """
+    if _env_flag("CBS_CLIENT_JSON_FAST_PATH"):
+        text = stream if isinstance(stream, (str, bytes)) else stream.read()
+        if text.lstrip()[:1] in ("{", "[", b"{", b"["):
+            try:
+                return json.loads(text)
+            except ValueError:
+                pass
+        stream = text
+    return yaml.load(stream, Loader=_YamlLoader)
+
+
+def _read_config_file(config_path):
+    """
+    Read the local configuration file.
+    Returns _NOT_FOUND if it is missing or unusable, so that the caller falls back to the CBS.
+    """
     try:
         logger.debug(f"opening config_path={config_path}")
         with open(config_path) as fp:
-            config = yaml.safe_load(fp)
-
-        policies = None
-        try:
-            logger.debug(f"opening policy_path={policy_path}")
-            with open(policy_path) as fp:
-                policies = json.load(fp)
-
-        except FileNotFoundError:
-            logger.debug("Policy File Not Found exception received")
-            pass
-
-        except (json.decoder.JSONDecodeError, ValueError) as e:
-            logger.error(f"The policy file '{policy_path}' has invalid JSON: %s", e)
-            pass
-
-        except Exception as e:
-            logger.error(f"An error occurred processing the policy file '{policy_path}': %s", e)
-            import traceback
-            traceback.print_exc(file=sys.stderr)
-            pass
-
-        if policies is not None:
-            if "policies" in policies:
-                logger.debug(f"Returning config read from {config_path} an policy read from {policy_path}")
-                ret = {"config": _recurse(config), "policies": policies["policies"]}
-            else:
-                logger.error(f"The policy file '{policy_path}' does NOT have a 'policies' block in it.")
-                ret = {"config": _recurse(config)}
-        else:
-            logger.debug(f"Returning config read from {config_path}")
-            ret = {"config": _recurse(config)}
-
-        return ret
+            return _parse_config(fp)
 
     except yaml.scanner.ScannerError as e:
         logger.error(f"The configuration file '{config_path}' has invalid YAML: {e}")
@@ -193,48 +415,328 @@ def get_all():
         traceback.print_exc(file=sys.stderr)
         pass
 
-    logger.debug("Fallback to using REST call")
-    config = _get_path("service_component_all")
-    return _recurse(config)
+    return _NOT_FOUND
 
 
-def get_config():
+def _read_policy_file(policy_path):
     """
-    If not configured locally,
-    hit the CBS service_component endpoint for the configuration.
-
-    Local configuration comes from $CBS_CLIENT_CONFIG_PATH,
-    defaulted to /app-config/application_config.yaml.
-
-    TODO: should we take in a "retry" boolean, and retry on behalf of the caller?
-    Currently, we return an exception and let the application decide how it wants to proceed (Crash, try again, etc).
+    Read the local policy file.
+    Returns None if it is missing or unusable.
     """
-    config_path = os.getenv("CBS_CLIENT_CONFIG_PATH", DEFAULT_CONFIG_PATH)
-    if config_path == "":
-        config_path = DEFAULT_CONFIG_PATH
-
     try:
-        logger.debug(f"opening config_path={config_path}")
-        with open(config_path) as fp:
-            config = yaml.safe_load(fp)
+        logger.debug(f"opening policy_path={policy_path}")
+        with open(policy_path) as fp:
+            return json.load(fp)
 
-        logger.debug(f"Returning config read from {config_path}")
-        return _recurse(config)
-
-    except yaml.scanner.ScannerError as e:
-        logger.error(f"The configuration file '{config_path}' has invalid YAML: {e}")
+    except FileNotFoundError:
+        logger.debug("Policy File Not Found exception received")
         pass
 
-    except FileNotFoundError:
-        logger.debug("Config File Not Found exception received")
+    except (json.decoder.JSONDecodeError, ValueError) as e:
+        logger.error(f"The policy file '{policy_path}' has invalid JSON: %s", e)
         pass
 
     except Exception as e:
-        logger.error(f"An error occurred processing the configuration file '{config_path}': {e}")
+        logger.error(f"An error occurred processing the policy file '{policy_path}': %s", e)
         import traceback
         traceback.print_exc(file=sys.stderr)
         pass
 
-    logger.debug("Fallback to using REST call")
-    config = _get_path("service_component")
-    return _recurse(config)
+    return None
+
+
+def _find_subtree(config, keys):
+    for key in keys:
+        if not isinstance(config, dict) or key not in config:
+            return _NO_SUBTREE
+        config = config[key]
+    return config
+
+
+def _parse_subtree(config_path, text, keys, stamp):
+    """
+    Return the subtree at keys of the configuration text, or _NO_SUBTREE.
+    With $CBS_CLIENT_JSON_FAST_PATH, a JSON document is only decoded along the way to the subtree;
+    a YAML document is parsed whole, once per version of the file.
+    """
+    if _env_flag("CBS_CLIENT_JSON_FAST_PATH") and jsonscan.is_object(text):
+        try:
+            return jsonscan.get(text, keys, _NO_SUBTREE)
+        except ValueError:
+            pass
+    with _subtrees_lock:
+        entry = _subtrees.get((config_path, None))
+    if entry is not None and entry[0] == stamp:
+        document = entry[1]
+    else:
+        document = _parse_config(text)
+        with _subtrees_lock:
+            _subtrees[(config_path, None)] = (stamp, document)
+    return _find_subtree(document, keys)
+
+
+def _subtree_from_file(config_path, keys):
+    """
+    Returns a Template of the subtree at keys of the local configuration, _NO_SUBTREE,
+    or _NOT_FOUND if the file is missing or unusable
+    """
+    stamp = _file_stamps((config_path,))[0]
+    if stamp is None:
+        return _NOT_FOUND
+    with _subtrees_lock:
+        entry = _subtrees.get((config_path, keys))
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+
+    try:
+        with open(config_path) as fp:
+            text = fp.read()
+        subtree = _parse_subtree(config_path, text, keys, stamp)
+    except FileNotFoundError:
+        return _NOT_FOUND
+    except Exception as e:
+        logger.error(f"An error occurred processing the configuration file '{config_path}': {e}")
+        return _NOT_FOUND
+
+    template = subtree if subtree is _NO_SUBTREE else Template(subtree)
+    with _subtrees_lock:
+        _subtrees[(config_path, keys)] = (stamp, template)
+    return template
+
+
+def _config_from_file(config_path):
+    """
+    Returns a Template of the local configuration, or _NOT_FOUND
+    """
+    config = _read_config_file(config_path)
+    if config is _NOT_FOUND:
+        return _NOT_FOUND
+
+    logger.debug(f"Returning config read from {config_path}")
+    return Template(config)
+
+
+def _all_from_files(config_path, policy_path):
+    """
+    Returns a Template of the local configuration and policies, or _NOT_FOUND.
+    References are only expanded in the configuration.
+    With $CBS_CLIENT_LAZY_POLICIES, returns an AllTemplate instead, and the policy file
+    is only read once the policies are used.
+    """
+    config = _read_config_file(config_path)
+    if config is _NOT_FOUND:
+        return _NOT_FOUND
+
+    if _env_flag("CBS_CLIENT_LAZY_POLICIES"):
+        logger.debug(f"Returning config read from {config_path}, with policies to be read from {policy_path}")
+        return AllTemplate(Template({"config": config}), PolicyFile(policy_path, _read_policy_file))
+
+    policies = _read_policy_file(policy_path)
+    if policies is not None:
+        if "policies" in policies:
+            logger.debug(f"Returning config read from {config_path} an policy read from {policy_path}")
+            return Template({"config": config, "policies": policies["policies"]}, skip=("policies",))
+        logger.error(f"The policy file '{policy_path}' does NOT have a 'policies' block in it.")
+    else:
+        logger.debug(f"Returning config read from {config_path}")
+    return Template({"config": config})
+
+
+def _all_from_cbs(config):
+    if _env_flag("CBS_CLIENT_LAZY_POLICIES"):
+        return AllTemplate(Template(config))
+    return Template(config)
+
+
+def _file_stamps(paths):
+    """
+    Identify the current version of each local file, so that a cached value can be
+    invalidated when a file is rewritten or swapped for another (e.g. a ConfigMap update).
+    """
+    stamps = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamps.append((st.st_ino, st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamps.append(None)
+    return tuple(stamps)
+
+
+def _render(key, template):
+    """
+    Render a template into the configuration to return, frozen if $CBS_CLIENT_FROZEN is set
+    """
+    value = template.render()
+    if key[-1]:
+        value = _last_frozen[key] = freeze(value, _last_frozen.get(key))
+    return value
+
+
+def _load(cbs_path, paths, from_files, from_cbs=Template, variant=()):
+    """
+    Load a configuration from the local files, falling back to the CBS cbs_path endpoint.
+    Concurrent loads of the same configuration are coalesced if $CBS_CLIENT_SINGLE_FLIGHT is set.
+    variant identifies the settings, beyond the paths, that the result depends on.
+    """
+    key = (cbs_path,) + paths + variant + (_env_flag("CBS_CLIENT_FROZEN"),)
+    if _env_flag("CBS_CLIENT_SINGLE_FLIGHT"):
+        return _flights.do(key, lambda: _load_once(key, cbs_path, paths, from_files, from_cbs))
+    return _load_once(key, cbs_path, paths, from_files, from_cbs)
+
+
+def _load_once(key, cbs_path, paths, from_files, from_cbs):
+    """
+    Load a configuration from the local files, falling back to the CBS cbs_path endpoint.
+
+    When $CBS_CLIENT_CACHE_TTL is set, the result is cached for that many seconds,
+    or until one of the local files changes. An expired entry whose source is known to be
+    unchanged (the files, or a CBS answer of 304 Not Modified to If-None-Match) is not
+    parsed again; only its ${VAR} references are expanded afresh.
+    """
+    ttl = _env_number("CBS_CLIENT_CACHE_TTL", 0)
+    if ttl <= 0:
+        template = from_files()
+        if template is _NOT_FOUND:
+            logger.debug("Fallback to using REST call")
+            template = from_cbs(_get_path(cbs_path))
+        return _render(key, template)
+
+    stamp = _file_stamps(paths)
+    entry = _cache.get(key)
+    if entry is not None and entry.stamp == stamp:
+        now = time.monotonic()
+        if now < entry.expires:
+            return entry.value
+        if not entry.from_cbs:
+            template, etag = entry.template, None
+        elif entry.etag:
+            config, etag = _fetch(cbs_path, entry.etag)
+            template = entry.template if config is None else from_cbs(config)
+        else:
+            template = None
+        if template is not None:
+            value = _render(key, template) if template.has_references else entry.value
+            _cache_store(key, _CacheEntry(value, template, stamp, now + ttl, entry.from_cbs, etag))
+            return value
+
+    template = from_files()
+    fetched = template is _NOT_FOUND
+    etag = None
+    if fetched:
+        logger.debug("Fallback to using REST call")
+        config, etag = _fetch(cbs_path)
+        template = from_cbs(config)
+    value = _render(key, template)
+    _cache_store(key, _CacheEntry(value, template, stamp, time.monotonic() + ttl, fetched, etag))
+    return value
+
+
+def _cache_store(key, entry):
+    with _cache_lock:
+        _cache[key] = entry
+
+
+#########
+# Public
+def close_session():
+    """
+    Close the pooled CBS connections.
+    The next REST fallback opens a new session, picking up any changed pool settings.
+    """
+    global _session, _session_pid
+    with _session_lock:
+        session, _session, _session_pid = _session, None, None
+    if session is not None:
+        session.close()
+
+
+def clear_cache():
+    """
+    Drop every configuration cached because of $CBS_CLIENT_CACHE_TTL, the subtrees
+    remembered by get_config_subtree(),
+    and the last known good configurations kept for the circuit breaker.
+    The next fetch from the CBS may be preloaded from a snapshot again.
+    """
+    with _cache_lock:
+        _cache.clear()
+    with _subtrees_lock:
+        _subtrees.clear()
+    _last_frozen.clear()
+    _last_good.clear()
+    _breaker.reset()
+    with _preload_lock:
+        _preloaded.clear()
+
+
+def get_all():
+    """
+    If not configured locally,
+    hit the CBS service_component_all endpoint
+
+    Local configuration comes from $CBS_CLIENT_CONFIG_PATH and $CBS_CLIENT_POLICY_PATH,
+    defaulted to /app-config/application_config.yaml and /etc/policies/policies.json.
+
+    If $CBS_CLIENT_LAZY_POLICIES is set, a policies.AllConfig mapping is returned instead of
+    a dict. The local policy file is then only read when the "policies" entry is first used,
+    and AllConfig.get_policy(policy_id) finds a single policy. Frozen results (see below)
+    include the policies.
+
+    If $CBS_CLIENT_CACHE_TTL or $CBS_CLIENT_SINGLE_FLIGHT is set, the returned object may be
+    shared with other callers, so it must not be modified.
+
+    If $CBS_CLIENT_FROZEN is set, a deeply frozen, hashable frozen.FrozenDict is returned instead,
+    sharing its unchanged parts with the previous one; unchanged, it is the same object.
+    """
+    config_path = _get_config_path()
+    policy_path = _get_policy_path()
+    return _load("service_component_all", (config_path, policy_path),
+                 lambda: _all_from_files(config_path, policy_path), _all_from_cbs,
+                 (_env_flag("CBS_CLIENT_LAZY_POLICIES"),))
+
+
+def get_config():
+    """
+    If not configured locally,
+    hit the CBS service_component endpoint for the configuration.
+
+    Local configuration comes from $CBS_CLIENT_CONFIG_PATH,
+    defaulted to /app-config/application_config.yaml.
+
+    If $CBS_CLIENT_CACHE_TTL or $CBS_CLIENT_SINGLE_FLIGHT is set, the returned object may be
+    shared with other callers, so it must not be modified.
+
+    If $CBS_CLIENT_FROZEN is set, a deeply frozen, hashable frozen.FrozenDict is returned instead,
+    sharing its unchanged parts with the previous one; unchanged, it is the same object.
+
+    By default, an exception is raised as soon as the CBS cannot be used, and the application
+    decides how it wants to proceed (Crash, try again, etc). Set $CBS_CLIENT_RETRY_MAX_ELAPSED
+    to have the client retry, and $CBS_CLIENT_BREAKER_THRESHOLD to fall back to the last
+    configuration fetched while the CBS is down.
+    """
+    config_path = _get_config_path()
+    return _load("service_component", (config_path,), lambda: _config_from_file(config_path))
+
+
+def get_config_subtree(path):
+    """
+    Return one subtree of the configuration get_config() would return, such as "streams_publishes".
+    path is a top level key, or a sequence of keys leading to the subtree; KeyError is raised if
+    there is nothing there.
+
+    From the local config file, with $CBS_CLIENT_JSON_FAST_PATH set, a JSON file is only decoded
+    along the way to the subtree. Each subtree is remembered until the file changes, and only its
+    ${VAR} references are expanded again on later calls, so it must not be modified.
+    Without a local file, the whole configuration is fetched from the CBS.
+    """
+    keys = (path,) if isinstance(path, str) else tuple(path)
+    config_path = _get_config_path()
+    template = _subtree_from_file(config_path, keys)
+    if template is _NOT_FOUND:
+        logger.debug("Fallback to using REST call")
+        template = _find_subtree(_get_path("service_component"), keys)
+        if template is not _NO_SUBTREE:
+            template = Template(template)
+    if template is _NO_SUBTREE:
+        raise KeyError(path)
+    return _render(("service_component", config_path, keys, _env_flag("CBS_CLIENT_FROZEN")), template)
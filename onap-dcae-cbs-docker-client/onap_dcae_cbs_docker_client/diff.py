@@ -0,0 +1,74 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+""" structural differences between two versions of a configuration """
+
+import collections
+from collections.abc import Mapping
+
+
+class ConfigDiff(collections.namedtuple("ConfigDiff", ["added", "removed", "changed"])):
+    """
+    The differences between two configurations.
+    Each field maps a path, a tuple of the keys and list indexes leading to a value, to:
+      added: the new value
+      removed: the old value
+      changed: an (old, new) tuple
+    A ConfigDiff is false when the configurations are equal.
+    """
+
+    __slots__ = ()
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+def _is_list(value):
+    return isinstance(value, (list, tuple))
+
+
+def _walk(old, new, path, diff):
+    if old is new:
+        # shared (e.g. cached or frozen) sub-trees cannot differ
+        return
+    if isinstance(old, Mapping) and isinstance(new, Mapping):
+        for key in old:
+            if key not in new:
+                diff.removed[path + (key,)] = old[key]
+            else:
+                _walk(old[key], new[key], path + (key,), diff)
+        for key in new:
+            if key not in old:
+                diff.added[path + (key,)] = new[key]
+    elif _is_list(old) and _is_list(new):
+        for index in range(min(len(old), len(new))):
+            _walk(old[index], new[index], path + (index,), diff)
+        for index in range(len(new), len(old)):
+            diff.removed[path + (index,)] = old[index]
+        for index in range(len(old), len(new)):
+            diff.added[path + (index,)] = new[index]
+    elif type(old) is not type(new) or old != new:
+        diff.changed[path] = (old, new)
+
+
+def config_diff(old, new):
+    """
+    Return a ConfigDiff describing how to get from the old configuration to the new one.
+    Dicts are compared key by key and lists index by index; anything else is a leaf.
+    """
+    diff = ConfigDiff({}, {}, {})
+    _walk(old, new, (), diff)
+    return diff
@@ -0,0 +1,164 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+"""
+expand ${VAR} references to environment variables in a configuration
+
+A string value may contain any number of ${VAR} or ${VAR:-default} references.
+The default is used when VAR is unset or empty; a reference to a missing VAR
+without a default raises ENVsMissing. Dict keys are never expanded.
+"""
+
+import os
+import re
+
+from onap_dcae_cbs_docker_client import get_module_logger
+from onap_dcae_cbs_docker_client.exceptions import ENVsMissing
+
+logger = get_module_logger(__name__)
+
+_PLACEHOLDER = re.compile(r"\$\{([^}:]+)(?::-([^}]*))?\}")
+
+
+class _StringTemplate:
+    """
+    A string split into literal text and (name, default) references
+    """
+
+    __slots__ = ("value", "parts")
+
+    def __init__(self, value, parts):
+        self.value = value
+        self.parts = parts
+
+    def render(self, env):
+        if len(self.parts) == 1:
+            return self._lookup(self.parts[0], env)
+        return "".join(part if isinstance(part, str) else self._lookup(part, env) for part in self.parts)
+
+    def _lookup(self, part, env):
+        name, default = part
+        value = env.get(name)
+        if value is not None and (value != "" or default is None):
+            return value
+        if default is not None:
+            return default
+        logger.error(f"Required ENV Variable '{name}' missing. Is '{self.value}' properly formatted?")
+        raise ENVsMissing(f"Required ENV Variable {name} missing. Is '{self.value}' properly formatted?")
+
+
+class _Node:
+    """
+    A dict or list with the keys (or indexes) of the children that hold references
+    """
+
+    __slots__ = ("children",)
+
+    def __init__(self, children):
+        self.children = children
+
+
+def _compile_string(value):
+    if "${" not in value:
+        return None
+    parts = []
+    pos = 0
+    for match in _PLACEHOLDER.finditer(value):
+        if match.start() > pos:
+            parts.append(value[pos:match.start()])
+        parts.append((match.group(1), match.group(2)))
+        pos = match.end()
+    if pos == 0:
+        return None
+    if pos < len(value):
+        parts.append(value[pos:])
+    return _StringTemplate(value, tuple(parts))
+
+
+def _compile(value, skip=()):
+    if isinstance(value, str):
+        return _compile_string(value)
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        return None
+    children = []
+    for key, item in items:
+        if key in skip:
+            continue
+        # most leaves are plain strings without references, or numbers: avoid a call for those
+        kind = type(item)
+        if kind is str:
+            if "${" not in item:
+                continue
+            plan = _compile_string(item)
+        elif kind is int or kind is float or kind is bool or item is None:
+            continue
+        else:
+            plan = _compile(item)
+        if plan is not None:
+            children.append((key, plan))
+    return _Node(tuple(children)) if children else None
+
+
+def _render(value, plan, env):
+    if isinstance(plan, _StringTemplate):
+        return plan.render(env)
+    copy = dict(value) if isinstance(value, dict) else list(value)
+    for key, child in plan.children:
+        copy[key] = _render(value[key], child, env)
+    return copy
+
+
+class Template:
+    """
+    A parsed configuration together with the location of every ${VAR} reference in it.
+
+    Compiling walks the whole document once. Each render() then reads os.environ once
+    and only revisits the recorded locations: it returns a new document in which the
+    dicts and lists on the way to a reference are copied and everything else is shared
+    with the original, which is never modified.
+
+    Top level keys listed in skip are left alone, e.g. the policies of get_all().
+    """
+
+    __slots__ = ("document", "_plan")
+
+    def __init__(self, document, skip=()):
+        self.document = document
+        self._plan = _compile(document, skip)
+
+    @property
+    def has_references(self):
+        return self._plan is not None
+
+    def render(self, environ=None):
+        """
+        Return the document with its references expanded from environ (by default, os.environ)
+        """
+        if self._plan is None:
+            return self.document
+        env = dict(os.environ) if environ is None else environ
+        return _render(self.document, self._plan, env)
+
+
+def substitute(document):
+    """
+    Return the document with its references expanded from os.environ
+    """
+    return Template(document).render()
@@ -0,0 +1,116 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+"""
+deeply frozen, hashable configurations
+
+freeze() turns dicts into FrozenDicts and lists into tuples. Given the previous frozen
+version of a configuration, it reuses every sub-tree of it that is unchanged, so
+versions share their common structure, an unchanged configuration comes back as the
+very same object, and diff.config_diff() skips the shared sub-trees.
+"""
+
+from collections.abc import Mapping
+
+_MISSING = object()
+
+
+class FrozenDict(Mapping):
+    """
+    A read-only, hashable mapping. Its values are frozen too, so it can be shared
+    between threads without copying or locking.
+    """
+
+    __slots__ = ("_items", "_hash")
+
+    def __init__(self, items=()):
+        self._items = dict(items)
+        self._hash = None
+
+    def __getitem__(self, key):
+        return self._items[key]
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(frozenset(self._items.items()))
+        return self._hash
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenDict):
+            return self is other or (hash(self) == hash(other) and self._items == other._items)
+        return Mapping.__eq__(self, other)
+
+    def __repr__(self):
+        return "FrozenDict({0!r})".format(self._items)
+
+    def __reduce__(self):
+        return (FrozenDict, (self._items,))
+
+
+def _same(value, previous):
+    return type(value) is type(previous) and value == previous
+
+
+def freeze(value, previous=None):
+    """
+    Return a deeply frozen copy of value: mappings become FrozenDicts, lists tuples, and sets frozensets.
+    The sub-trees of previous, an earlier result of freeze(), that are equal to those of value are reused.
+    """
+    if isinstance(value, Mapping):
+        old = previous if isinstance(previous, FrozenDict) else None
+        if old is not None and value is old:
+            return old
+        items = {}
+        shared = old is not None and len(old) == len(value)
+        for key, item in value.items():
+            old_item = old.get(key, _MISSING) if old is not None else None
+            items[key] = frozen = freeze(item, None if old_item is _MISSING else old_item)
+            shared = shared and old_item is frozen
+        return old if shared else FrozenDict(items)
+    if isinstance(value, (list, tuple)):
+        old = previous if isinstance(previous, tuple) else None
+        if old is not None and value is old:
+            return old
+        frozen = tuple(freeze(item, old[index] if old is not None and index < len(old) else None) for index, item in enumerate(value))
+        if old is not None and len(old) == len(frozen) and all(a is b for a, b in zip(old, frozen)):
+            return old
+        return frozen
+    if isinstance(value, (set, frozenset)):
+        frozen = frozenset(value)
+        return previous if _same(frozen, previous) else frozen
+    return previous if previous is not None and _same(value, previous) else value
+
+
+def thaw(value):
+    """
+    Return a mutable deep copy of a frozen configuration, with dicts and lists (e.g. for json.dumps)
+    """
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    if isinstance(value, frozenset):
+        return set(value)
+    return value
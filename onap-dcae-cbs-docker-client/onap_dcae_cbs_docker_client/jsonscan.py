@@ -0,0 +1,119 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+"""
+find values inside a JSON document without decoding all of it
+
+The functions work on offsets into the JSON text. Only the object keys on the way
+to a value are decoded; each sibling value that is stepped over is decoded on its
+own and dropped straight away, so no more than one of them is in memory at a time.
+Malformed JSON raises ValueError.
+"""
+
+import json
+import re
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+def _skip_whitespace(text, pos):
+    return _WHITESPACE.match(text, pos).end()
+
+
+def _expect(text, pos, char):
+    if text[pos:pos + 1] != char:
+        raise ValueError("Expecting '{0}' at position {1}".format(char, pos))
+    return pos + 1
+
+
+def value_end(text, pos):
+    """
+    Return the offset just past the JSON value starting at pos
+    """
+    return _decoder.raw_decode(text, pos)[1]
+
+
+def iter_elements(text, pos):
+    """
+    Yield each element of the JSON array starting at pos, decoded, one at a time
+    """
+    pos = _expect(text, _skip_whitespace(text, pos), "[")
+    pos = _skip_whitespace(text, pos)
+    if text[pos:pos + 1] == "]":
+        return
+    while True:
+        value, end = _decoder.raw_decode(text, pos)
+        yield value
+        pos = _skip_whitespace(text, end)
+        if text[pos:pos + 1] == "]":
+            return
+        pos = _skip_whitespace(text, _expect(text, pos, ","))
+
+
+def _member_value(text, pos, key):
+    """
+    Return the offset of the value of key in the JSON object starting at pos, or None
+    """
+    if text[pos:pos + 1] != "{":
+        return None
+    pos = _skip_whitespace(text, pos + 1)
+    if text[pos:pos + 1] == "}":
+        return None
+    while True:
+        pos = _expect(text, pos, '"')
+        name, pos = json.decoder.scanstring(text, pos)
+        pos = _expect(text, _skip_whitespace(text, pos), ":")
+        start = _skip_whitespace(text, pos)
+        if name == key:
+            return start
+        pos = _skip_whitespace(text, value_end(text, start))
+        if text[pos:pos + 1] == "}":
+            return None
+        pos = _skip_whitespace(text, _expect(text, pos, ","))
+
+
+def locate(text, path, pos=0):
+    """
+    Return the offset of the value found by following path, a sequence of object keys,
+    from the JSON value at pos; or None if there is no such value.
+    The value itself is not decoded.
+    """
+    start = _skip_whitespace(text, pos)
+    for key in path:
+        start = _member_value(text, start, key)
+        if start is None:
+            return None
+    return start
+
+
+def get(text, path, missing=None, pos=0):
+    """
+    Return the value found by following path, a sequence of object keys, from the JSON
+    value at pos, decoded by a single pass over its text; or missing if there is no such value
+    """
+    start = locate(text, path, pos)
+    if start is None:
+        return missing
+    return _decoder.raw_decode(text, start)[0]
+
+
+def is_object(text):
+    """
+    Return whether the JSON text is an object
+    """
+    pos = _skip_whitespace(text, 0)
+    return text[pos:pos + 1] == "{"
@@ -0,0 +1,191 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+""" the result of get_all(), with the policies read from the local policy file on demand """
+
+import threading
+from collections.abc import MutableMapping
+
+from onap_dcae_cbs_docker_client import get_module_logger
+from onap_dcae_cbs_docker_client import jsonscan
+
+logger = get_module_logger(__name__)
+
+_NOT_LOADED = object()
+
+
+def policy_id(item):
+    """
+    Return the id of a policy item, in either the policy-sync ("metadata": {"policy-id": ...})
+    or the older CBS ("policy_id": ...) format
+    """
+    if not isinstance(item, dict):
+        return None
+    metadata = item.get("metadata")
+    if isinstance(metadata, dict) and "policy-id" in metadata:
+        return metadata["policy-id"]
+    return item.get("policy_id")
+
+
+def _find_policy(policies, wanted):
+    items = policies.get("items") if isinstance(policies, dict) else None
+    for item in items or ():
+        if policy_id(item) == wanted:
+            return item
+    return None
+
+
+class PolicyFile:
+    """
+    The local policy file, read when first needed.
+
+    policies is the content of its "policies" block, or None if the file is missing or unusable.
+    Until then, get_policy() scans the "items" array for a single policy instead, decoding one
+    item at a time and keeping none but the one it returns.
+    """
+
+    def __init__(self, path, read):
+        """
+        read(path) returns the decoded policy file, or None; it is in charge of logging problems
+        """
+        self.path = path
+        self._read = read
+        self._lock = threading.Lock()
+        self._policies = _NOT_LOADED
+
+    @property
+    def policies(self):
+        with self._lock:
+            if self._policies is _NOT_LOADED:
+                policies = self._read(self.path)
+                if policies is not None and "policies" not in policies:
+                    logger.error(f"The policy file '{self.path}' does NOT have a 'policies' block in it.")
+                    policies = None
+                self._policies = None if policies is None else policies["policies"]
+            return self._policies
+
+    def get_policy(self, wanted):
+        """
+        Return the policy item with the policy id wanted, or None
+        """
+        if self._policies is _NOT_LOADED:
+            try:
+                return self._scan(wanted)
+            except (OSError, ValueError) as e:
+                # leave it to the full read to report the problem
+                logger.debug(f"Could not scan the policy file '{self.path}': {e}")
+        return _find_policy(self.policies, wanted)
+
+    def _scan(self, wanted):
+        with open(self.path) as fp:
+            text = fp.read()
+        start = jsonscan.locate(text, ("policies", "items"))
+        if start is None or text[start:start + 1] != "[":
+            raise ValueError("no policies.items array")
+        for item in jsonscan.iter_elements(text, start):
+            if policy_id(item) == wanted:
+                return item
+        return None
+
+
+class AllConfig(MutableMapping):
+    """
+    What get_all() returns: a mapping with the "config" and, if there are any, "policies" entries.
+
+    When the policies come from the local policy file, the file is only read when the
+    "policies" entry is first used (including by iterating over or comparing the mapping).
+    """
+
+    def __init__(self, data, policy_file=None):
+        self._data = dict(data)
+        self._policy_file = policy_file
+        self._lock = threading.Lock()
+
+    def _load_policies(self):
+        if self._policy_file is None:
+            return
+        # the same object may be shared by many threads (see get_all()); the policy file is
+        # only let go of once its policies are in place, so no thread ever finds neither
+        with self._lock:
+            policy_file = self._policy_file
+            if policy_file is not None and "policies" not in self._data:
+                policies = policy_file.policies
+                if policies is not None:
+                    self._data["policies"] = policies
+            self._policy_file = None
+
+    def __getitem__(self, key):
+        if key == "policies":
+            self._load_policies()
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        if key == "policies":
+            with self._lock:
+                self._data[key] = value
+                self._policy_file = None
+        else:
+            self._data[key] = value
+
+    def __delitem__(self, key):
+        if key == "policies":
+            self._load_policies()
+        del self._data[key]
+
+    def __contains__(self, key):
+        if key == "policies":
+            self._load_policies()
+        return key in self._data
+
+    def __iter__(self):
+        self._load_policies()
+        return iter(self._data)
+
+    def __len__(self):
+        self._load_policies()
+        return len(self._data)
+
+    def __repr__(self):
+        self._load_policies()
+        return "AllConfig({0!r})".format(self._data)
+
+    def get_policy(self, wanted):
+        """
+        Return the policy item with the policy id wanted, or None
+        """
+        policy_file = self._policy_file
+        if policy_file is not None:
+            return policy_file.get_policy(wanted)
+        return _find_policy(self._data.get("policies"), wanted)
+
+
+class AllTemplate:
+    """
+    Renders AllConfig objects from a Template of the configuration, like envsubst.Template does
+    """
+
+    __slots__ = ("template", "policy_file")
+
+    def __init__(self, template, policy_file=None):
+        self.template = template
+        self.policy_file = policy_file
+
+    @property
+    def has_references(self):
+        return self.template.has_references
+
+    def render(self, environ=None):
+        return AllConfig(self.template.render(environ), self.policy_file)
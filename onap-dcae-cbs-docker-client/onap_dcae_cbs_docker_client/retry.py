@@ -0,0 +1,92 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+""" retries with backoff, and a circuit breaker, for requests to the CBS """
+
+import random
+import threading
+import time
+
+
+def retry_call(fn, retryable, max_elapsed, base_delay, max_delay, sleep=None, clock=None):
+    """
+    Call fn() until it succeeds, raises an exception for which retryable(e) is false,
+    or max_elapsed seconds have gone by, in which case its last exception is raised.
+
+    The wait before retry n is drawn uniformly from [0, min(max_delay, base_delay * 2**n)]
+    ("full jitter"), so that many clients failing together do not retry together.
+    """
+    sleep = sleep or time.sleep
+    clock = clock or time.monotonic
+    start = clock()
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            if not retryable(e):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            if clock() + delay - start > max_elapsed:
+                raise
+        sleep(delay)
+        attempt += 1
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive failures of the CBS.
+
+    After threshold consecutive failures the breaker opens and allow() returns False,
+    so callers stop sending requests. Once reset_timeout seconds have passed, a single
+    caller is allowed through: its success closes the breaker, its failure re-opens it.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+    def allow(self, reset_timeout):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial or self._clock() - self._opened_at < reset_timeout:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self, threshold):
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= threshold:
+                self._opened_at = self._clock()
+            self._trial = False
+
+    def reset(self):
+        self.record_success()
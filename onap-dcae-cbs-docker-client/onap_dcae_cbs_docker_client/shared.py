@@ -0,0 +1,175 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+"""
+one copy of the configuration for all the worker processes of a preforking server
+
+The master process loads the configuration once and publish()es it, already
+${VAR}-expanded, as compact JSON in a file on a memory-backed filesystem
+(/dev/shm by default). Each worker maps that file read-only with a SharedConfig,
+which is told, like a watcher.ConfigWatcher, when the master publishes a new
+version. The workers share the page cache of the file, and never parse YAML, call
+the CBS or expand references themselves; each decodes the JSON once per version.
+
+In a gunicorn config file, for instance:
+
+    def when_ready(server):
+        shared.publish(client.get_config())
+
+    def post_worker_init(worker):
+        worker.cbs_config = shared.SharedConfig()
+        worker.cbs_config.start()
+"""
+
+import json
+import mmap
+import os
+import tempfile
+import time
+
+from onap_dcae_cbs_docker_client import get_module_logger
+from onap_dcae_cbs_docker_client import client
+from onap_dcae_cbs_docker_client.frozen import freeze, thaw
+from onap_dcae_cbs_docker_client.watcher import ConfigWatcher
+
+logger = get_module_logger(__name__)
+
+_FORMAT = 1
+
+# workers only stat() the file between inotify events, so they can look often
+DEFAULT_INTERVAL = 1.0
+
+
+def shared_path():
+    """
+    Return $CBS_CLIENT_SHARED_PATH, defaulted to a file named after $HOSTNAME in /dev/shm,
+    or in the temporary directory where there is no /dev/shm
+    """
+    path = os.getenv("CBS_CLIENT_SHARED_PATH")
+    if path:
+        return path
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, "onap-cbs-config-{0}.json".format(os.getenv("HOSTNAME", "default")))
+
+
+def publish(config, path=None, mode=0o600):
+    """
+    Atomically replace the shared configuration with config, and return the path of the file.
+
+    The file holds the expanded configuration, secrets included, so by default only the
+    publishing user can read it. Pass e.g. mode=0o640 when the workers run as another user.
+    """
+    path = path or shared_path()
+    if not isinstance(config, dict):
+        # a frozen.FrozenDict or policies.AllConfig
+        config = thaw(config)
+    payload = json.dumps(config, separators=(",", ":")).encode("utf-8")
+    header = json.dumps({"format": _FORMAT, "generation": time.time_ns(), "length": len(payload)})
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".{0}.".format(os.path.basename(path)))
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(header.encode("utf-8") + b"\n" + payload)
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    logger.debug(f"Published the configuration to {path}")
+    return path
+
+
+class _Mapping:
+    """
+    A read-only mapping of one published version of the shared configuration
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as fp:
+            self.map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            newline = self.map.find(b"\n")
+            header = json.loads(self.map[:newline])
+            if header.get("format") != _FORMAT or len(self.map) - newline - 1 != header.get("length"):
+                raise ValueError("unknown format, or truncated")
+        except (ValueError, AttributeError) as e:
+            self.map.close()
+            raise ValueError("{0} is not a shared configuration: {1}".format(path, e))
+        self.generation = header["generation"]
+        self.start = newline + 1
+
+    def decode(self):
+        return json.loads(self.map[self.start:])
+
+    def close(self):
+        self.map.close()
+
+
+class SharedConfig(ConfigWatcher):
+    """
+    A worker's read-only view of the configuration published by the master process.
+
+    start() maps the current version and watches for new ones, which are announced to the
+    callbacks registered with add_callback(), as (new_config, diff). The current version is
+    in the config attribute. With $CBS_CLIENT_FROZEN set, it is frozen, and shares its
+    unchanged parts with the previous version.
+    """
+
+    def __init__(self, path=None, interval=DEFAULT_INTERVAL, use_inotify=True):
+        super().__init__(config_path=path or shared_path(), interval=interval, use_inotify=use_inotify)
+        self._mapping = None
+
+    def stop(self):
+        super().stop()
+        with self._lock:
+            if self._mapping is not None:
+                self._mapping.close()
+                self._mapping = None
+
+    def _refresh(self, wf):
+        """
+        Map the file again if it was replaced; return True if it holds a new version
+        """
+        stamp = client._file_stamps((wf.path,))[0]
+        if stamp == wf.stamp and self._mapping is not None:
+            return False
+        wf.stamp = stamp
+        try:
+            mapping = _Mapping(wf.path)
+        except (OSError, ValueError) as e:
+            # not published yet, or being replaced: keep the version we have
+            logger.debug(f"Cannot map the shared configuration: {e}")
+            wf.stamp = None
+            return False
+        if self._mapping is not None:
+            if mapping.generation == self._mapping.generation:
+                mapping.close()
+                return False
+            self._mapping.close()
+        self._mapping = mapping
+        return True
+
+    def _parse(self):
+        if self._mapping is None:
+            return None
+        try:
+            config = self._mapping.decode()
+        except ValueError as e:
+            logger.error(f"The shared configuration '{self._files[0].path}' could not be decoded: {e}")
+            return None
+        if client._env_flag("CBS_CLIENT_FROZEN"):
+            config = freeze(config, self.config)
+        return config
@@ -0,0 +1,85 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+"""
+on-disk snapshots of the configurations fetched from the CBS
+
+A snapshot file holds a one line JSON header, with the SHA-256 of the payload and the
+ETag the CBS sent, followed by the configuration as JSON. Snapshots are written to a
+temporary file and renamed into place, so a reader never sees a partial snapshot, and
+a snapshot whose checksum does not match is ignored.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+from onap_dcae_cbs_docker_client import get_module_logger
+
+logger = get_module_logger(__name__)
+
+_FORMAT = 1
+
+
+def snapshot_path(directory, name):
+    return os.path.join(directory, "{0}.snapshot".format(name))
+
+
+def save(directory, name, config, etag=None):
+    """
+    Atomically replace the snapshot called name in directory. Returns False if it could not be written.
+    """
+    payload = json.dumps(config, separators=(",", ":")).encode("utf-8")
+    header = json.dumps({"format": _FORMAT, "sha256": hashlib.sha256(payload).hexdigest(), "etag": etag})
+    path = snapshot_path(directory, name)
+    tmp = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".{0}.".format(name))
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(header.encode("utf-8") + b"\n" + payload)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp, path)
+        return True
+    except OSError as e:
+        logger.error(f"Could not write the configuration snapshot {path}: {e}")
+        if tmp is not None and os.path.exists(tmp):
+            os.unlink(tmp)
+        return False
+
+
+def load(directory, name):
+    """
+    Return the (config, etag) saved in the snapshot called name in directory,
+    or None if there is no valid snapshot.
+    """
+    path = snapshot_path(directory, name)
+    try:
+        with open(path, "rb") as fp:
+            header = json.loads(fp.readline())
+            payload = fp.read()
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not read the configuration snapshot {path}: {e}")
+        return None
+
+    if not isinstance(header, dict) or header.get("format") != _FORMAT or header.get("sha256") != hashlib.sha256(payload).hexdigest():
+        logger.error(f"Ignoring the configuration snapshot {path}: it is corrupt")
+        return None
+    return json.loads(payload), header.get("etag")
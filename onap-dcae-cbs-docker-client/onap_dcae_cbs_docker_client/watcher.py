@@ -0,0 +1,301 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+""" notify the application when its local configuration or policy files change """
+
+import ctypes
+import ctypes.util
+import errno
+import hashlib
+import json
+import os
+import select
+import threading
+
+from onap_dcae_cbs_docker_client import get_module_logger
+from onap_dcae_cbs_docker_client import client
+from onap_dcae_cbs_docker_client.diff import config_diff
+
+logger = get_module_logger(__name__)
+
+# inotify(7) flags
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+# Kubernetes updates a mounted ConfigMap by creating a new timestamped directory and
+# renaming a "..data" symlink over the old one, so the events to watch for are on the
+# directories holding the files, not on the files themselves.
+_WATCH_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+
+DEFAULT_INTERVAL = 5.0
+
+# how long to wait for a burst of events (e.g. a ConfigMap swap) to finish
+_SETTLE_TIME = 0.1
+
+
+class _Inotify:
+    """
+    Minimal ctypes binding to the Linux inotify API
+    """
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def fileno(self):
+        return self._fd
+
+    def watch(self, path):
+        """
+        Watch a directory; watching the same directory again is harmless
+        """
+        if self._add_watch(self._fd, os.fsencode(path), _WATCH_MASK) < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+
+    def drain(self):
+        """
+        Discard all pending events
+        """
+        while True:
+            try:
+                if not os.read(self._fd, 65536):
+                    return
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    return
+                raise
+
+    def close(self):
+        os.close(self._fd)
+
+
+class _WatchedFile:
+    def __init__(self, path):
+        self.path = path
+        self.stamp = None
+        self.digest = None
+        self.data = None
+        self.parsed = None
+        self.parsed_digest = None
+
+
+class ConfigWatcher:
+    """
+    Watch the local configuration file, and optionally the policy file, and call the
+    registered callbacks with (new_config, diff) whenever their content changes.
+
+    On Linux the containing directories are watched with inotify, which also catches
+    Kubernetes' symlink-swap ConfigMap updates. Elsewhere, or if inotify is unavailable,
+    the files are checked with stat() every interval seconds. Either way a file is only
+    re-parsed when its content actually changed.
+
+    With include_policies, the configuration has the same shape as get_all() returns
+    for local files, otherwise the same as get_config(). diff is a ConfigDiff against
+    the previous configuration.
+    """
+
+    def __init__(self, config_path=None, policy_path=None, include_policies=False,
+                 interval=DEFAULT_INTERVAL, use_inotify=True):
+        self._files = [_WatchedFile(config_path or client._get_config_path())]
+        if include_policies:
+            self._files.append(_WatchedFile(policy_path or client._get_policy_path()))
+        self._include_policies = include_policies
+        self._interval = interval
+        self._use_inotify = use_inotify
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._inotify = None
+        self._wakeup = None
+        self.config = None
+
+    def add_callback(self, callback):
+        """
+        Register callback(new_config, diff) to be called after each change
+        """
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        self._callbacks.remove(callback)
+
+    def start(self):
+        """
+        Load the current configuration and start watching for changes in a daemon thread
+        """
+        if self._thread is not None:
+            return
+        self.check(notify=False)
+        self._stopped.clear()
+        if self._use_inotify:
+            try:
+                self._inotify = _Inotify()
+                self._add_watches()
+            except (OSError, AttributeError) as e:
+                logger.debug(f"inotify is not available, falling back to polling: {e}")
+                if self._inotify is not None:
+                    self._inotify.close()
+                self._inotify = None
+        self._wakeup = os.pipe()
+        self._thread = threading.Thread(target=self._run, name="cbs-config-watcher")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop watching
+        """
+        if self._thread is None:
+            return
+        self._stopped.set()
+        os.write(self._wakeup[1], b"x")
+        self._thread.join()
+        self._thread = None
+        for fd in self._wakeup:
+            os.close(fd)
+        self._wakeup = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def check(self, notify=True):
+        """
+        Look for changes now. Returns True, after running the callbacks, if the configuration changed.
+        """
+        with self._lock:
+            changed = False
+            for wf in self._files:
+                changed = self._refresh(wf) or changed
+            if not changed and self.config is not None:
+                return False
+
+            new_config = self._parse()
+            if new_config is None:
+                return False
+            old_config, self.config = self.config, new_config
+
+        if notify:
+            diff = config_diff(old_config, new_config)
+            if diff:
+                for callback in list(self._callbacks):
+                    try:
+                        callback(new_config, diff)
+                    except Exception as e:
+                        logger.error(f"Config watcher callback {callback} failed: {e}")
+                return True
+        return False
+
+    def _refresh(self, wf):
+        """
+        Re-read a file if its stat() changed; return True if its content changed
+        """
+        stamp = client._file_stamps((wf.path,))[0]
+        if stamp == wf.stamp and wf.data is not None:
+            return False
+        wf.stamp = stamp
+        try:
+            with open(wf.path, "rb") as fp:
+                data = fp.read()
+        except OSError as e:
+            logger.debug(f"Cannot read {wf.path}: {e}")
+            data = b""
+        digest = hashlib.sha256(data).digest()
+        if digest == wf.digest:
+            return False
+        wf.digest = digest
+        wf.data = data
+        return True
+
+    def _parse_file(self, wf, parse):
+        """
+        Parse a file's content, reusing the previous result if that content did not change
+        """
+        if wf.parsed_digest != wf.digest:
+            wf.parsed = parse(wf.data) if wf.data else None
+            wf.parsed_digest = wf.digest
+        return wf.parsed
+
+    def _parse(self):
+        config_file = self._files[0]
+        try:
+            config = self._parse_file(config_file, lambda data: client._recurse(client._parse_config(data)))
+        except Exception as e:
+            logger.error(f"The configuration file '{config_file.path}' could not be loaded: {e}")
+            return None
+        if config is None:
+            return None
+        if not self._include_policies:
+            return config
+
+        ret = {"config": config}
+        policy_file = self._files[1]
+        try:
+            policies = self._parse_file(policy_file, json.loads)
+        except ValueError as e:
+            logger.error(f"The policy file '{policy_file.path}' has invalid JSON: {e}")
+            policies = None
+        if policies is not None:
+            if "policies" in policies:
+                ret["policies"] = policies["policies"]
+            else:
+                logger.error(f"The policy file '{policy_file.path}' does NOT have a 'policies' block in it.")
+        return ret
+
+    def _add_watches(self):
+        dirs = set()
+        for wf in self._files:
+            dirs.add(os.path.dirname(os.path.abspath(wf.path)))
+            dirs.add(os.path.dirname(os.path.realpath(wf.path)))
+        for d in dirs:
+            try:
+                self._inotify.watch(d)
+            except OSError as e:
+                logger.debug(f"Cannot watch {d}: {e}")
+
+    def _run(self):
+        wakeup = self._wakeup[0]
+        while not self._stopped.is_set():
+            if self._inotify is not None:
+                ready = select.select([self._inotify, wakeup], [], [], self._interval)[0]
+                if self._inotify in ready:
+                    # let the rest of an update land before looking at the files
+                    self._stopped.wait(_SETTLE_TIME)
+                    self._inotify.drain()
+                    self._add_watches()
+            else:
+                select.select([wakeup], [], [], self._interval)
+            if self._stopped.is_set():
+                break
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Config watcher failed to check for changes: {e}")
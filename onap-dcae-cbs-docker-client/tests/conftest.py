@@ -20,12 +20,15 @@
 import pytest
 from requests.exceptions import HTTPError, ConnectionError
 
+from onap_dcae_cbs_docker_client.client import close_session, clear_cache
+
 
 class FakeResponse:
     def __init__(self, status_code, thejson):
         self.status_code = status_code
         self.thejson = thejson
         self.text = ""
+        self.headers = {}
 
     def raise_for_status(self):
         if self.status_code > 299:
@@ -35,6 +38,26 @@ class FakeResponse:
         return self.thejson
 
 
+@pytest.fixture(autouse=True)
+def fresh_session():
+    """
+    make sure no pooled CBS session leaks from one test into the next
+    """
+    close_session()
+    yield
+    close_session()
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    """
+    make sure no cached configuration leaks from one test into the next
+    """
+    clear_cache()
+    yield
+    clear_cache()
+
+
 good_resp_all = FakeResponse(
     status_code=200,
     thejson={
@@ -77,7 +100,7 @@ def monkeyed_requests_get():
     mock for the CBS get
     """
 
-    def _monkeyed_requests_get(url):
+    def _monkeyed_requests_get(session, url, **kwargs):
         if url == "http://config-binding-service:10000/service_component_all/testhostname":
             return good_resp_all
         elif url == "http://config-binding-service:10000/service_component/testhostname":
@@ -94,7 +117,7 @@ def monkeyed_requests_get_https():
     mock for the CBS get
     """
 
-    def _monkeyed_requests_get_https(url, verify=""):
+    def _monkeyed_requests_get_https(session, url, **kwargs):
         if url == "https://config-binding-service:10443/service_component_all/testhostname":
             return good_resp_all
         elif url == "https://config-binding-service:10443/service_component/testhostname":
@@ -111,7 +134,7 @@ def monkeyed_requests_get_with_env():
     mock for the CBS get
     """
 
-    def _monkeyed_requests_get(url):
+    def _monkeyed_requests_get(session, url, **kwargs):
         if url == "http://config-binding-service:10000/service_component_all/testhostname":
             return good_resp_all_env
         elif url == "http://config-binding-service:10000/service_component/testhostname":
@@ -128,7 +151,7 @@ def monkeyed_requests_get_https_env():
     mock for the CBS get
     """
 
-    def _monkeyed_requests_get_https(url, verify=""):
+    def _monkeyed_requests_get_https(session, url, **kwargs):
         if url == "https://config-binding-service:10443/service_component_all/testhostname":
             return good_resp_all_env
         elif url == "https://config-binding-service:10443/service_component/testhostname":
@@ -145,7 +168,7 @@ def monkeyed_requests_get_http_with_wrong_env():
     mock for the CBS get
     """
 
-    def _monkeyed_requests_get(url):
+    def _monkeyed_requests_get(session, url, **kwargs):
         if url == "http://config-binding-service:10000/service_component_all/testhostname":
             return good_resp_all_wrong_env
         elif url == "http://config-binding-service:10000/service_component/testhostname":
@@ -158,7 +181,7 @@ def monkeyed_requests_get_http_with_wrong_env():
 
 @pytest.fixture
 def monkeyed_requests_get_404():
-    def _monkeyed_requests_get_404(url):
+    def _monkeyed_requests_get_404(session, url, **kwargs):
         """
         get that pretends that key doesnt exist
         """
@@ -174,7 +197,7 @@ def monkeyed_requests_get_404():
 
 @pytest.fixture
 def monkeyed_requests_get_unreachable():
-    def _monkeyed_requests_get_unreachable(_url):
+    def _monkeyed_requests_get_unreachable(session, url, **kwargs):
         raise ConnectionError()
 
     return _monkeyed_requests_get_unreachable
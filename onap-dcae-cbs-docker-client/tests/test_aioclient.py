@@ -0,0 +1,119 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+""" unit tests for the asyncio client """
+import asyncio
+import socket
+
+import pytest
+from aiohttp import web
+
+from onap_dcae_cbs_docker_client import aioclient
+from onap_dcae_cbs_docker_client.exceptions import CantGetConfig, CBSUnreachable, ENVsMissing
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _run(monkeypatch, coro_fn, routes=None):
+    """
+    run coro_fn() on a new event loop, with the CBS served by a local aiohttp app
+    """
+    port = _free_port()
+    monkeypatch.setattr("onap_dcae_cbs_docker_client.client._get_endpoint",
+                        lambda path: ("http://127.0.0.1:{0}/{1}/testhostname".format(port, path), None))
+    monkeypatch.setenv("CBS_CLIENT_CONFIG_PATH", "/no/such/path")
+
+    async def _main():
+        runner = None
+        if routes is not None:
+            app = web.Application()
+            app.add_routes(routes)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            await web.TCPSite(runner, "127.0.0.1", port).start()
+        try:
+            return await coro_fn()
+        finally:
+            await aioclient.close_session()
+            if runner is not None:
+                await runner.cleanup()
+
+    return asyncio.run(_main())
+
+
+def test_rest(monkeypatch):
+    hits = []
+
+    async def _config(request):
+        hits.append(request.path)
+        return web.json_response({"key_to_your_heart": "${TEST_ENV}"})
+
+    async def _all(request):
+        return web.json_response({"config": {"key": "${TEST_ENV}"}, "policies": {"items": []}})
+
+    routes = [web.get("/service_component/testhostname", _config),
+              web.get("/service_component_all/testhostname", _all)]
+
+    async def _calls():
+        configs = await asyncio.gather(*[aioclient.get_config() for _ in range(20)])
+        return configs, await aioclient.get_all()
+
+    configs, everything = _run(monkeypatch, _calls, routes)
+    assert configs == [{"key_to_your_heart": "test_env"}] * 20
+    assert len(hits) == 20
+    assert everything == {"config": {"key": "test_env"}, "policies": {"items": []}}
+
+
+def test_local_files(monkeypatch, tmp_path):
+    config_file = tmp_path / "application_config.yaml"
+    config_file.write_text("key: ${TEST_ENV}\n")
+    policy_file = tmp_path / "policies.json"
+    policy_file.write_text('{"policies": {"items": ["${TEST_ENV}"]}}')
+
+    async def _calls():
+        monkeypatch.setenv("CBS_CLIENT_CONFIG_PATH", str(config_file))
+        monkeypatch.setenv("CBS_CLIENT_POLICY_PATH", str(policy_file))
+        return await aioclient.get_config(), await aioclient.get_all()
+
+    config, everything = _run(monkeypatch, _calls)
+    assert config == {"key": "test_env"}
+    assert everything == {"config": {"key": "test_env"}, "policies": {"items": ["${TEST_ENV}"]}}
+
+
+def test_bad_status(monkeypatch):
+    async def _missing(request):
+        return web.Response(status=404, text="not here")
+
+    routes = [web.get("/service_component/testhostname", _missing)]
+    with pytest.raises(CantGetConfig) as e:
+        _run(monkeypatch, aioclient.get_config, routes)
+    assert e.value.code == 404
+    assert e.value.text == "not here"
+
+
+def test_unreachable(monkeypatch):
+    with pytest.raises(CBSUnreachable):
+        _run(monkeypatch, aioclient.get_config)
+
+
+def test_badenv(monkeypatch):
+    monkeypatch.delenv("CONFIG_BINDING_SERVICE")
+    with pytest.raises(ENVsMissing):
+        asyncio.run(aioclient.get_config())
@@ -23,12 +23,16 @@ import json
 import os
 import yaml
 
+from requests.exceptions import ReadTimeout
 from unittest.mock import patch
 
-from onap_dcae_cbs_docker_client.client import get_config, get_all
+from onap_dcae_cbs_docker_client import client
+from onap_dcae_cbs_docker_client.client import get_config, get_all, close_session
 from onap_dcae_cbs_docker_client.client import default_config_path, default_policy_path
 from onap_dcae_cbs_docker_client.exceptions import CantGetConfig, CBSUnreachable, ENVsMissing
 
+from conftest import FakeResponse
+
 
 DEFAULT_REQUESTS_CONFIG = {"key_to_your_heart": 666}
 DEFAULT_REQUESTS_CONFIG_ALL = {
@@ -40,7 +44,7 @@ DEFAULT_REQUESTS_CONFIG_ALL = {
 
 
 def test_http(monkeypatch, monkeyed_requests_get):
-    monkeypatch.setattr("requests.get", monkeyed_requests_get)
+    monkeypatch.setattr("requests.Session.get", monkeyed_requests_get)
 
     assert get_config() == DEFAULT_REQUESTS_CONFIG
 
@@ -52,7 +56,7 @@ def test_https_url(monkeypatch, monkeyed_requests_get_https):
     this doesn't really test https; because of all the cert stuff,
     however it tests that the url gets formed correctly in the presence of this env variable
     """
-    monkeypatch.setattr("requests.get", monkeyed_requests_get_https)
+    monkeypatch.setattr("requests.Session.get", monkeyed_requests_get_https)
     monkeypatch.setenv("DCAE_CA_CERTPATH", "1")
 
     assert get_config() == {"key_to_your_heart": 666}
@@ -66,7 +70,7 @@ def test_https_url(monkeypatch, monkeyed_requests_get_https):
 
 
 def test_bad_hostname(monkeypatch, monkeyed_requests_get_404):
-    monkeypatch.setattr("requests.get", monkeyed_requests_get_404)
+    monkeypatch.setattr("requests.Session.get", monkeyed_requests_get_404)
     with pytest.raises(CantGetConfig):
         get_config()
     with pytest.raises(CantGetConfig):
@@ -80,7 +84,7 @@ def test_bad_hostname(monkeypatch, monkeyed_requests_get_404):
 
 
 def test_unreachable(monkeypatch, monkeyed_requests_get_unreachable):
-    monkeypatch.setattr("requests.get", monkeyed_requests_get_unreachable)
+    monkeypatch.setattr("requests.Session.get", monkeyed_requests_get_unreachable)
     with pytest.raises(CBSUnreachable):
         get_config()
     with pytest.raises(CBSUnreachable):
@@ -96,7 +100,7 @@ def test_badenv(monkeypatch):
 
 
 def test_http_with_env(monkeypatch, monkeyed_requests_get_with_env):
-    monkeypatch.setattr("requests.get", monkeyed_requests_get_with_env)
+    monkeypatch.setattr("requests.Session.get", monkeyed_requests_get_with_env)
 
     assert get_config() == {"key_to_your_heart": "test_env"}
 
@@ -109,7 +113,7 @@ def test_http_with_env(monkeypatch, monkeyed_requests_get_with_env):
 
 
 def test_https_with_env(monkeypatch, monkeyed_requests_get_https_env):
-    monkeypatch.setattr("requests.get", monkeyed_requests_get_https_env)
+    monkeypatch.setattr("requests.Session.get", monkeyed_requests_get_https_env)
     monkeypatch.setenv("DCAE_CA_CERTPATH", "1")
 
     assert get_config() == {"key_to_your_heart": "test_env"}
@@ -123,7 +127,7 @@ def test_https_with_env(monkeypatch, monkeyed_requests_get_https_env):
 
 
 def test_http_with_wrong_env(monkeypatch, monkeyed_requests_get_http_with_wrong_env):
-    monkeypatch.setattr("requests.get", monkeyed_requests_get_http_with_wrong_env)
+    monkeypatch.setattr("requests.Session.get", monkeyed_requests_get_http_with_wrong_env)
     with pytest.raises(ENVsMissing):
         get_config()
     with pytest.raises(ENVsMissing):
@@ -230,7 +234,7 @@ def test_config_file_both_exist(monkeypatch, monkeyed_requests_get):
     We vary WHICH file is being pointed at using the environment variables.
     """
 
-    monkeypatch.setattr("requests.get", monkeyed_requests_get)
+    monkeypatch.setattr("requests.Session.get", monkeyed_requests_get)
 
     monkeypatch.setenv("CONFIG_EXISTS", "yes")
     monkeypatch.setenv("POLICY_EXISTS", "yes")
@@ -277,7 +281,7 @@ def test_config_file_config_exists_policy_does_not(monkeypatch, monkeyed_request
     the expected configuration to be returned is different.
     """
 
-    monkeypatch.setattr("requests.get", monkeyed_requests_get)
+    monkeypatch.setattr("requests.Session.get", monkeyed_requests_get)
 
     monkeypatch.setenv("CONFIG_EXISTS", "yes")
     monkeypatch.setenv("POLICY_EXISTS", "no")
@@ -321,7 +325,7 @@ def test_config_file_config_does_not_policy_exists(monkeypatch, monkeyed_request
     the expected configuration to be returned is different.
     """
 
-    monkeypatch.setattr("requests.get", monkeyed_requests_get)
+    monkeypatch.setattr("requests.Session.get", monkeyed_requests_get)
 
     monkeypatch.setenv("CONFIG_EXISTS", "no")
     monkeypatch.setenv("POLICY_EXISTS", "yes")
@@ -365,7 +369,7 @@ def test_config_file_various_exceptions(monkeypatch, monkeyed_requests_get):
     Exceptions on the configuration file act as if the configuration file does not exist.
     """
 
-    monkeypatch.setattr("requests.get", monkeyed_requests_get)
+    monkeypatch.setattr("requests.Session.get", monkeyed_requests_get)
 
     monkeypatch.setenv("CONFIG_EXISTS", "yes")
     monkeypatch.setenv("POLICY_EXISTS", "yes")
@@ -413,3 +417,154 @@ def test_config_file_various_exceptions(monkeypatch, monkeyed_requests_get):
 
             ga = get_all()
             assert ga == expected_get_all
+
+
+################
+################
+# Tests for the pooled CBS session
+################
+################
+
+
+def test_session_is_reused(monkeypatch):
+    calls = []
+
+    def _get(session, url, **kwargs):
+        calls.append((session, url, kwargs))
+        return FakeResponse(status_code=200, thejson={"key_to_your_heart": 666})
+
+    monkeypatch.setattr("requests.Session.get", _get)
+    monkeypatch.setenv("CBS_CLIENT_CONNECT_TIMEOUT", "1.5")
+    monkeypatch.setenv("CBS_CLIENT_READ_TIMEOUT", "7")
+
+    get_config()
+    get_config()
+
+    assert len(calls) == 2
+    assert calls[0][0] is calls[1][0]
+    assert calls[0][2] == {"timeout": (1.5, 7.0)}
+
+
+def test_session_pool_size(monkeypatch):
+    monkeypatch.setenv("CBS_CLIENT_POOL_SIZE", "3")
+    session = client._get_session()
+    assert session is client._get_session()
+    assert session.get_adapter("https://config-binding-service:10443")._pool_maxsize == 3
+
+    close_session()
+    monkeypatch.setenv("CBS_CLIENT_POOL_SIZE", "not a number")
+    assert client._get_session().get_adapter("http://config-binding-service:10000")._pool_maxsize == client.DEFAULT_POOL_SIZE
+
+
+def test_timeout_is_unreachable(monkeypatch):
+    def _get(session, url, **kwargs):
+        raise ReadTimeout()
+
+    monkeypatch.setattr("requests.Session.get", _get)
+    with pytest.raises(CBSUnreachable):
+        get_config()
+
+
+################
+################
+# Tests for the $CBS_CLIENT_CACHE_TTL cache
+################
+################
+
+
+def test_cache_file(monkeypatch, tmp_path):
+    config_file = tmp_path / "application_config.yaml"
+    config_file.write_text("key: ${TEST_ENV}\n")
+    monkeypatch.setenv("CBS_CLIENT_CONFIG_PATH", str(config_file))
+    monkeypatch.setenv("CBS_CLIENT_CACHE_TTL", "60")
+
+    first = get_config()
+    assert first == {"key": "test_env"}
+    assert get_config() is first
+
+    # a rewritten file is picked up before the ttl runs out
+    config_file.write_text("key: changed\nenv: ${TEST_ENV}\n")
+    second = get_config()
+    assert second == {"key": "changed", "env": "test_env"}
+    assert get_config() is second
+
+    # once the ttl runs out, an unchanged file is not parsed again, but its references are re-expanded
+    def _unexpected_read(path):
+        raise AssertionError("unexpected read of {0}".format(path))
+
+    monkeypatch.setattr(client, "_read_config_file", _unexpected_read)
+    monkeypatch.setenv("TEST_ENV", "new_env")
+    now = client.time.monotonic()
+    monkeypatch.setattr("onap_dcae_cbs_docker_client.client.time.monotonic", lambda: now + 61)
+    assert get_config() == {"key": "changed", "env": "new_env"}
+
+
+def test_cache_disabled(monkeypatch, tmp_path):
+    config_file = tmp_path / "application_config.yaml"
+    config_file.write_text("key: value\n")
+    monkeypatch.setenv("CBS_CLIENT_CONFIG_PATH", str(config_file))
+
+    assert get_config() is not get_config()
+
+
+def test_cache_revalidates_with_etag(monkeypatch):
+    calls = []
+
+    def _get(session, url, **kwargs):
+        calls.append(kwargs.get("headers"))
+        if kwargs.get("headers", {}).get("If-None-Match") == '"v1"':
+            return FakeResponse(status_code=304, thejson=None)
+        resp = FakeResponse(status_code=200, thejson={"key_to_your_heart": "${TEST_ENV}"})
+        resp.headers = {"ETag": '"v1"'}
+        return resp
+
+    monkeypatch.setattr("requests.Session.get", _get)
+    monkeypatch.setenv("CBS_CLIENT_CONFIG_PATH", "/no/such/path")
+    monkeypatch.setenv("CBS_CLIENT_CACHE_TTL", "60")
+
+    first = get_config()
+    assert first == {"key_to_your_heart": "test_env"}
+    assert get_config() is first
+    assert calls == [None]
+
+    now = client.time.monotonic()
+    monkeypatch.setattr("onap_dcae_cbs_docker_client.client.time.monotonic", lambda: now + 61)
+    assert get_config() == first
+    assert calls == [None, {"If-None-Match": '"v1"'}]
+
+
+################
+################
+# Tests for the YAML/JSON loaders
+################
+################
+
+
+def test_yaml_loader(monkeypatch, tmp_path):
+    if hasattr(yaml, "CSafeLoader"):
+        assert client._YamlLoader is yaml.CSafeLoader
+
+    config_file = tmp_path / "application_config.yaml"
+    config_file.write_text("key: ${TEST_ENV}\nlist: [1, 2.5, true]\n")
+    monkeypatch.setenv("CBS_CLIENT_CONFIG_PATH", str(config_file))
+    expected = {"key": "test_env", "list": [1, 2.5, True]}
+    assert get_config() == expected
+
+    monkeypatch.setattr(client, "_YamlLoader", yaml.SafeLoader)
+    assert get_config() == expected
+
+
+def test_json_fast_path(monkeypatch, tmp_path):
+    monkeypatch.setenv("CBS_CLIENT_JSON_FAST_PATH", "true")
+    config_file = tmp_path / "application_config.yaml"
+    monkeypatch.setenv("CBS_CLIENT_CONFIG_PATH", str(config_file))
+
+    config_file.write_text('  {"key": "${TEST_ENV}", "exp": 1e3}')
+    assert get_config() == {"key": "test_env", "exp": 1000.0}
+
+    # YAML flow style looks like JSON, but is not
+    config_file.write_text("{key: '${TEST_ENV}', exp: 1e3}")
+    assert get_config() == {"key": "test_env", "exp": "1e3"}
+
+    config_file.write_text("key: value\n")
+    assert get_config() == {"key": "value"}
@@ -0,0 +1,80 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+""" unit tests for ${VAR} expansion """
+import copy
+
+import pytest
+
+from onap_dcae_cbs_docker_client.envsubst import Template, substitute
+from onap_dcae_cbs_docker_client.exceptions import ENVsMissing
+
+
+def test_whole_and_embedded_references():
+    assert substitute("${TEST_ENV}") == "test_env"
+    assert substitute("http://${TEST_ENV}:${PORT:-8080}/x") == "http://test_env:8080/x"
+    assert substitute("no references") == "no references"
+    assert substitute("${not closed") == "${not closed"
+    assert substitute(42) == 42
+
+
+def test_defaults(monkeypatch):
+    assert substitute("${UNSET_ENV:-fallback}") == "fallback"
+    assert substitute("${UNSET_ENV:-}") == ""
+    monkeypatch.setenv("EMPTY_ENV", "")
+    assert substitute("${EMPTY_ENV:-fallback}") == "fallback"
+    assert substitute("${EMPTY_ENV}") == ""
+
+
+def test_missing_reference():
+    with pytest.raises(ENVsMissing):
+        substitute({"a": ["ok", "${UNSET_ENV}"]})
+
+
+def test_document_is_not_modified():
+    document = {
+        "${TEST_ENV}": "keys are not expanded",
+        "streams": {"a": {"url": "http://${TEST_ENV}"}, "b": {"url": "static"}},
+        "list": [1, "${TEST_ENV}", {"x": "${TEST_ENV}"}],
+        "untouched": {"deep": [1, 2, 3]},
+    }
+    original = copy.deepcopy(document)
+
+    result = substitute(document)
+
+    assert document == original
+    assert result == {
+        "${TEST_ENV}": "keys are not expanded",
+        "streams": {"a": {"url": "http://test_env"}, "b": {"url": "static"}},
+        "list": [1, "test_env", {"x": "test_env"}],
+        "untouched": {"deep": [1, 2, 3]},
+    }
+    # only the containers holding references are copied
+    assert result["untouched"] is document["untouched"]
+    assert result["streams"]["b"] is document["streams"]["b"]
+    assert result["streams"]["a"] is not document["streams"]["a"]
+
+
+def test_template_render():
+    template = Template({"config": {"a": "${V}"}, "policies": {"p": "${V}"}}, skip=("policies",))
+    assert template.has_references
+    assert template.render({"V": "1"}) == {"config": {"a": "1"}, "policies": {"p": "${V}"}}
+    assert template.render({"V": "2"}) == {"config": {"a": "2"}, "policies": {"p": "${V}"}}
+
+    document = {"a": [1, 2]}
+    template = Template(document)
+    assert not template.has_references
+    assert template.render() is document
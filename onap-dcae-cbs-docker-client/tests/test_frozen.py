@@ -0,0 +1,120 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+""" unit tests for the frozen configurations """
+import pickle
+import threading
+
+import pytest
+
+from onap_dcae_cbs_docker_client.client import get_all, get_config
+from onap_dcae_cbs_docker_client.diff import config_diff
+from onap_dcae_cbs_docker_client.frozen import FrozenDict, freeze, thaw
+
+
+CONFIG = {"a": {"b": [1, {"c": "x"}], "d": True}, "e": {"f": 1.5}, "g": None}
+
+
+def test_freeze():
+    frozen = freeze(CONFIG)
+    assert isinstance(frozen, FrozenDict)
+    assert frozen == {"a": {"b": (1, {"c": "x"}), "d": True}, "e": {"f": 1.5}, "g": None}
+    assert frozen["a"]["b"] == (1, FrozenDict({"c": "x"}))
+    assert hash(frozen) == hash(freeze(CONFIG))
+    assert {frozen: 1}[freeze(CONFIG)] == 1
+    with pytest.raises(TypeError):
+        frozen["a"] = 1
+    with pytest.raises(AttributeError):
+        frozen.x = 1
+    assert thaw(frozen) == CONFIG
+    assert isinstance(thaw(frozen)["a"]["b"], list)
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+
+def test_structural_sharing():
+    old = freeze(CONFIG)
+    assert freeze(CONFIG, old) is old
+
+    changed = thaw(old)
+    changed["e"]["f"] = 2
+    new = freeze(changed, old)
+    assert new is not old
+    assert new["a"] is old["a"]
+    assert new["e"] is not old["e"]
+
+    # True == 1, but it is still a change
+    changed["a"]["b"][0] = True
+    assert freeze(changed, old)["a"]["b"][0] is True
+
+    diff = config_diff(old, new)
+    assert diff.changed == {("e", "f"): (1.5, 2)}
+    assert not config_diff(old, freeze(CONFIG, old))
+
+
+@pytest.fixture
+def frozen_files(monkeypatch, tmp_path):
+    monkeypatch.setenv("CBS_CLIENT_FROZEN", "true")
+    config_file = tmp_path / "application_config.yaml"
+    config_file.write_text("a:\n  b: [1, 2]\nkey: ${TEST_ENV}\n")
+    policy_file = tmp_path / "policies.json"
+    policy_file.write_text('{"policies": {"items": [{"policy_id": "p"}]}}')
+    monkeypatch.setenv("CBS_CLIENT_CONFIG_PATH", str(config_file))
+    monkeypatch.setenv("CBS_CLIENT_POLICY_PATH", str(policy_file))
+    return config_file
+
+
+def test_get_config_frozen(frozen_files):
+    config = get_config()
+    assert config == {"a": {"b": (1, 2)}, "key": "test_env"}
+    assert isinstance(config, FrozenDict)
+    assert get_config() is config
+
+    frozen_files.write_text("a:\n  b: [1, 2]\nkey: changed\n")
+    new = get_config()
+    assert new["a"] is config["a"]
+    assert config_diff(config, new).changed == {("key",): ("test_env", "changed")}
+
+
+def test_get_all_frozen(frozen_files):
+    everything = get_all()
+    assert isinstance(everything, FrozenDict)
+    assert everything["policies"] == {"items": ({"policy_id": "p"},)}
+
+
+def test_frozen_with_cache(frozen_files, monkeypatch):
+    monkeypatch.setenv("CBS_CLIENT_CACHE_TTL", "60")
+    config = get_config()
+    assert isinstance(config, FrozenDict)
+    assert get_config() is config
+    monkeypatch.delenv("CBS_CLIENT_FROZEN")
+    assert isinstance(get_config(), dict)
+
+
+def test_shared_between_threads(frozen_files):
+    config = get_config()
+    results = []
+
+    def _read():
+        for _ in range(1000):
+            results.append(get_config()["a"]["b"][1])
+
+    threads = [threading.Thread(target=_read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [2] * 4000
+    assert get_config() is config
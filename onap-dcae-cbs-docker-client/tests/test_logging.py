@@ -0,0 +1,71 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+""" unit tests for the logging of the client """
+import io
+import json
+import logging
+
+from onap_dcae_cbs_docker_client import get_module_logger, JsonFormatter, LazyJSON
+from onap_dcae_cbs_docker_client import client
+from onap_dcae_cbs_docker_client.client import get_config
+
+from conftest import FakeResponse
+
+
+def _no_dumps(*args, **kwargs):
+    raise AssertionError("serialized although nothing was logged")
+
+
+def _handlers(logger):
+    return [handler for handler in logger.handlers if getattr(handler, "_cbs_client_handler", False)]
+
+
+def test_no_duplicate_handlers():
+    logger = get_module_logger("tests.logging.dups")
+    assert get_module_logger("tests.logging.dups") is logger
+    assert len(_handlers(logger)) == 1
+
+
+def test_level_from_env(monkeypatch):
+    monkeypatch.setenv("CBS_CLIENT_LOG_LEVEL", "warning")
+    assert get_module_logger("tests.logging.level").level == logging.WARNING
+    monkeypatch.setenv("CBS_CLIENT_LOG_LEVEL", "chatty")
+    assert get_module_logger("tests.logging.badlevel").level == logging.DEBUG
+
+
+def test_json_format(monkeypatch):
+    monkeypatch.setenv("CBS_CLIENT_LOG_FORMAT", "json")
+    logger = get_module_logger("tests.logging.json")
+    (handler,) = _handlers(logger)
+    assert isinstance(handler.formatter, JsonFormatter)
+
+    stream = io.StringIO()
+    handler.setStream(stream)
+    logger.info("fetched %s", LazyJSON({"a": [1]}), extra={"cbs_url": "http://cbs/x"})
+    record = json.loads(stream.getvalue())
+    assert record["level"] == "INFO"
+    assert record["logger"] == "tests.logging.json"
+    assert record["message"] == 'fetched {"a": [1]}'
+    assert record["cbs_url"] == "http://cbs/x"
+
+
+def test_config_not_serialized_unless_logged(monkeypatch):
+    resp = FakeResponse(200, {"key": "value"})
+    monkeypatch.setattr("requests.Session.get", lambda session, url, **kwargs: resp)
+    monkeypatch.setattr(json, "dumps", _no_dumps)
+    monkeypatch.setattr(client.logger, "level", logging.INFO)
+    assert get_config() == {"key": "value"}
@@ -0,0 +1,158 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+""" unit tests for the lazily read policies of get_all() """
+import json
+import threading
+import time
+
+import pytest
+
+from onap_dcae_cbs_docker_client import client, jsonscan
+from onap_dcae_cbs_docker_client.client import get_all
+from onap_dcae_cbs_docker_client.policies import AllConfig
+
+from conftest import FakeResponse
+
+
+POLICIES = {
+    "policies": {
+        "items": [
+            {"metadata": {"policy-id": "policy.{0}".format(n)}, "config": {"threshold": n, "text": "}] \\\" {"}}
+            for n in range(50)
+        ] + [{"policy_id": "old.style", "policy_body": {}}],
+        "event": {"action": "gathered"},
+    }
+}
+
+
+@pytest.fixture
+def local_files(monkeypatch, tmp_path):
+    config_file = tmp_path / "application_config.yaml"
+    config_file.write_text("key: ${TEST_ENV}\n")
+    policy_file = tmp_path / "policies.json"
+    policy_file.write_text(json.dumps(POLICIES, indent=1))
+    monkeypatch.setenv("CBS_CLIENT_CONFIG_PATH", str(config_file))
+    monkeypatch.setenv("CBS_CLIENT_POLICY_PATH", str(policy_file))
+    monkeypatch.setenv("CBS_CLIENT_LAZY_POLICIES", "true")
+
+    reads = []
+    read_policy_file = client._read_policy_file
+
+    def _read_policy_file(path):
+        reads.append(path)
+        return read_policy_file(path)
+
+    monkeypatch.setattr(client, "_read_policy_file", _read_policy_file)
+    return reads
+
+
+def test_jsonscan():
+    text = ' { "a" : [1, {"}": "]"}], "b": {"c": {"d": [10, 20 , 30]}}, "e": null } '
+    assert jsonscan.locate(text, ("b", "c", "d")) == text.index("[10")
+    assert jsonscan.get(text, ("b", "c")) == {"d": [10, 20, 30]}
+    assert jsonscan.get(text, ("b", "x")) is None
+    assert jsonscan.get(text, ("a", "x"), "missing") == "missing"
+    assert jsonscan.is_object(text)
+    assert not jsonscan.is_object(" [1]")
+    assert list(jsonscan.iter_elements(text, jsonscan.locate(text, ("b", "c", "d")))) == [10, 20, 30]
+    assert list(jsonscan.iter_elements("[ ]", 0)) == []
+    with pytest.raises(ValueError):
+        jsonscan.get('{"a": [1, 2}', ("b",))
+
+
+def test_policies_are_read_on_first_use(local_files):
+    everything = get_all()
+    assert isinstance(everything, AllConfig)
+    assert everything["config"] == {"key": "test_env"}
+    assert local_files == []
+
+    assert everything["policies"] == POLICIES["policies"]
+    assert len(local_files) == 1
+    assert everything == {"config": {"key": "test_env"}, "policies": POLICIES["policies"]}
+    assert len(local_files) == 1
+
+
+def test_get_policy_scans_the_file(local_files):
+    everything = get_all()
+    assert everything.get_policy("policy.42") == POLICIES["policies"]["items"][42]
+    assert everything.get_policy("old.style") == {"policy_id": "old.style", "policy_body": {}}
+    assert everything.get_policy("no.such.policy") is None
+    assert local_files == []
+
+    # once loaded, the policies themselves are searched
+    assert "policies" in everything
+    assert everything.get_policy("policy.7")["config"]["threshold"] == 7
+    assert len(local_files) == 1
+
+
+def test_missing_policies(local_files, monkeypatch, tmp_path):
+    monkeypatch.setenv("CBS_CLIENT_POLICY_PATH", str(tmp_path / "missing.json"))
+    everything = get_all()
+    assert everything.get_policy("policy.1") is None
+    assert "policies" not in everything
+    assert dict(everything) == {"config": {"key": "test_env"}}
+
+
+def test_policies_are_read_eagerly_by_default(local_files, monkeypatch):
+    monkeypatch.delenv("CBS_CLIENT_LAZY_POLICIES")
+    everything = get_all()
+    assert type(everything) is dict
+    assert len(local_files) == 1
+    assert json.loads(json.dumps(everything)) == {"config": {"key": "test_env"}, "policies": POLICIES["policies"]}
+
+
+def test_get_policy_from_cbs(monkeypatch):
+    resp = FakeResponse(200, {"config": {"key": "value"}, "policies": POLICIES["policies"]})
+    monkeypatch.setattr("requests.Session.get", lambda session, url, **kwargs: resp)
+    monkeypatch.setenv("CBS_CLIENT_LAZY_POLICIES", "true")
+    everything = get_all()
+    assert everything.get_policy("policy.3")["config"]["threshold"] == 3
+
+
+def test_all_config_mapping():
+    everything = AllConfig({"config": {"a": 1}})
+    everything["policies"] = {"items": []}
+    everything["other"] = 1
+    del everything["other"]
+    assert dict(everything) == {"config": {"a": 1}, "policies": {"items": []}}
+    assert json.loads(json.dumps(dict(everything))) == dict(everything)
+
+
+def test_policies_shared_by_threads(local_files, monkeypatch):
+    read_policy_file = client._read_policy_file
+
+    def _slow_read(path):
+        time.sleep(0.2)
+        return read_policy_file(path)
+
+    monkeypatch.setattr(client, "_read_policy_file", _slow_read)
+    everything = get_all()
+    results = []
+
+    def use():
+        try:
+            results.append(("policies" in everything, everything["policies"] == POLICIES["policies"]))
+        except KeyError as e:
+            results.append(e)
+
+    threads = [threading.Thread(target=use) for i in range(4)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert results == [(True, True)] * 4
+    assert len(local_files) == 1
@@ -0,0 +1,163 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+""" unit tests for retries and the circuit breaker """
+import pytest
+
+from onap_dcae_cbs_docker_client import client
+from onap_dcae_cbs_docker_client.client import get_config
+from onap_dcae_cbs_docker_client.exceptions import CantGetConfig, CBSUnreachable
+from onap_dcae_cbs_docker_client.retry import CircuitBreaker, retry_call
+
+from conftest import FakeResponse
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+def test_retry_call_until_success():
+    clock = FakeClock()
+    results = [CBSUnreachable(), CBSUnreachable(), CBSUnreachable(), "ok"]
+
+    def _fn():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert retry_call(_fn, lambda e: True, 100, 1, 3, sleep=clock.sleep, clock=clock) == "ok"
+    assert len(clock.sleeps) == 3
+    # full jitter: each wait is somewhere below the capped exponential backoff
+    for delay, cap in zip(clock.sleeps, [1, 2, 3]):
+        assert 0 <= delay <= cap
+
+
+def test_retry_call_gives_up():
+    clock = FakeClock()
+    calls = []
+
+    def _fn():
+        calls.append(clock.now)
+        raise CBSUnreachable()
+
+    with pytest.raises(CBSUnreachable):
+        retry_call(_fn, lambda e: True, 10, 1, 4, sleep=clock.sleep, clock=clock)
+    assert clock.now <= 10
+    assert len(calls) > 1
+
+    calls.clear()
+    with pytest.raises(ValueError):
+        retry_call(lambda: calls.append(1) or int("x"), lambda e: False, 10, 1, 4, sleep=clock.sleep, clock=clock)
+    assert calls == [1]
+
+
+def test_circuit_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker(clock=clock)
+    breaker.record_failure(2)
+    assert breaker.allow(30)
+    breaker.record_failure(2)
+    assert breaker.is_open
+    assert not breaker.allow(30)
+
+    clock.now += 30
+    assert breaker.allow(30)  # the one trial request
+    assert not breaker.allow(30)
+    breaker.record_failure(2)
+    assert not breaker.allow(30)
+
+    clock.now += 30
+    assert breaker.allow(30)
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.allow(30)
+
+
+def test_client_retries(monkeypatch):
+    responses = [FakeResponse(503, None), FakeResponse(200, {"key": "value"})]
+    monkeypatch.setattr("requests.Session.get", lambda session, url, **kwargs: responses.pop(0))
+    monkeypatch.setattr("onap_dcae_cbs_docker_client.retry.time.sleep", lambda delay: None)
+    monkeypatch.setenv("CBS_CLIENT_RETRY_MAX_ELAPSED", "60")
+    monkeypatch.setenv("CBS_CLIENT_RETRY_BASE_DELAY", "5")
+
+    assert get_config() == {"key": "value"}
+    assert responses == []
+
+    # client errors are not retried
+    responses.extend([FakeResponse(404, None), FakeResponse(200, {"key": "value"})])
+    with pytest.raises(CantGetConfig):
+        get_config()
+    assert len(responses) == 1
+
+
+def test_client_circuit_breaker(monkeypatch):
+    calls = []
+
+    def _get(session, url, **kwargs):
+        calls.append(url)
+        if len(calls) == 1:
+            return FakeResponse(200, {"key": "${TEST_ENV}"})
+        return FakeResponse(500, None)
+
+    monkeypatch.setattr("requests.Session.get", _get)
+    monkeypatch.setenv("CBS_CLIENT_BREAKER_THRESHOLD", "2")
+
+    assert get_config() == {"key": "test_env"}
+
+    # below the threshold, failures are raised as usual
+    with pytest.raises(CantGetConfig):
+        get_config()
+
+    # the failure that opens the breaker, and the calls while it is open, get the last good config
+    assert get_config() == {"key": "test_env"}
+    assert get_config() == {"key": "test_env"}
+    assert len(calls) == 3
+
+    # with nothing to fall back on, the breaker fails fast
+    with pytest.raises(CBSUnreachable):
+        client.get_all()
+    assert len(calls) == 3
+
+
+def test_client_circuit_breaker_trial_error(monkeypatch):
+    class BadJSON(FakeResponse):
+        def json(self):
+            raise ValueError("malformed")
+
+    responses = [FakeResponse(500, None), BadJSON(200, None), FakeResponse(200, {"key": "value"})]
+    monkeypatch.setattr("requests.Session.get", lambda session, url, **kwargs: responses.pop(0))
+    monkeypatch.setenv("CBS_CLIENT_BREAKER_THRESHOLD", "1")
+    monkeypatch.setenv("CBS_CLIENT_BREAKER_RESET", "0")
+
+    with pytest.raises(CantGetConfig):
+        get_config()
+    assert client._breaker.is_open
+
+    # a trial request failing in some other way still closes the breaker
+    with pytest.raises(ValueError):
+        get_config()
+    assert not client._breaker.is_open
+    assert get_config() == {"key": "value"}
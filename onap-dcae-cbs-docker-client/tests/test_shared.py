@@ -0,0 +1,126 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+""" unit tests for the configuration shared between processes """
+import multiprocessing
+import os
+import queue
+import stat
+
+import pytest
+
+from onap_dcae_cbs_docker_client import shared
+from onap_dcae_cbs_docker_client.frozen import FrozenDict, freeze
+from onap_dcae_cbs_docker_client.policies import AllConfig
+
+
+def test_shared_path(monkeypatch):
+    monkeypatch.setenv("CBS_CLIENT_SHARED_PATH", "/somewhere/config.json")
+    assert shared.shared_path() == "/somewhere/config.json"
+    monkeypatch.delenv("CBS_CLIENT_SHARED_PATH")
+    assert shared.shared_path().endswith("onap-cbs-config-testhostname.json")
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_publish_and_notify(tmp_path, use_inotify):
+    path = str(tmp_path / "config.json")
+    shared.publish({"key": "value", "other": [1]}, path)
+    changes = queue.Queue()
+    view = shared.SharedConfig(path, interval=0.05, use_inotify=use_inotify)
+    view.add_callback(lambda config, diff: changes.put((config, diff)))
+    view.start()
+    try:
+        assert view.config == {"key": "value", "other": [1]}
+
+        shared.publish({"key": "value", "other": [2]}, path)
+        config, diff = changes.get(timeout=5)
+        assert config == {"key": "value", "other": [2]}
+        assert diff.changed == {("other", 0): (1, 2)}
+        assert view.config is config
+
+        # publishing the same configuration again is not a change
+        shared.publish({"key": "value", "other": [2]}, path)
+        with pytest.raises(queue.Empty):
+            changes.get(timeout=0.3)
+    finally:
+        view.stop()
+
+
+def test_publish_mappings(tmp_path):
+    path = str(tmp_path / "config.json")
+    shared.publish(freeze({"a": [1, {"b": 2}]}), path)
+    view = shared.SharedConfig(path)
+    view.check(notify=False)
+    assert view.config == {"a": [1, {"b": 2}]}
+
+    shared.publish(AllConfig({"config": {"a": 1}}), path)
+    view.check(notify=False)
+    assert view.config == {"config": {"a": 1}}
+
+
+def test_frozen(tmp_path, monkeypatch):
+    monkeypatch.setenv("CBS_CLIENT_FROZEN", "true")
+    path = str(tmp_path / "config.json")
+    shared.publish({"a": {"b": 1}, "c": 1}, path)
+    view = shared.SharedConfig(path)
+    view.check()
+    old = view.config
+    assert isinstance(old, FrozenDict)
+
+    shared.publish({"a": {"b": 1}, "c": 2}, path)
+    assert view.check()
+    assert view.config["a"] is old["a"]
+
+
+def test_not_published(tmp_path):
+    view = shared.SharedConfig(str(tmp_path / "config.json"))
+    assert view.check() is False
+    assert view.config is None
+
+    (tmp_path / "config.json").write_text('{"format": 1, "generation": 1, "length": 100}\n{}')
+    assert view.check() is False
+    assert view.config is None
+
+    shared.publish({"a": 1}, str(tmp_path / "config.json"))
+    view.check()
+    assert view.config == {"a": 1}
+
+
+def _worker(path, results):
+    view = shared.SharedConfig(path)
+    view.check(notify=False)
+    results.put(view.config)
+
+
+def test_forked_workers(tmp_path):
+    path = str(tmp_path / "config.json")
+    shared.publish({"key": "value"}, path)
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = [context.Process(target=_worker, args=(path, results)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    assert [results.get(timeout=10) for _ in workers] == [{"key": "value"}] * 3
+    for worker in workers:
+        worker.join()
+
+
+def test_publish_mode(tmp_path):
+    path = str(tmp_path / "config.json")
+    shared.publish({"password": "secret"}, path)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    shared.publish({"password": "secret"}, path, mode=0o640)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
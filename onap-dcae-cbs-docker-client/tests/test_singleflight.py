@@ -0,0 +1,132 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+""" unit tests for the coalescing of concurrent loads """
+import threading
+import time
+
+import pytest
+
+from onap_dcae_cbs_docker_client import client
+from onap_dcae_cbs_docker_client.client import get_config
+from onap_dcae_cbs_docker_client.exceptions import CantGetConfig
+from onap_dcae_cbs_docker_client.singleflight import SingleFlight
+
+from conftest import FakeResponse
+
+THREADS = 8
+
+
+def _run_together(fn):
+    """
+    call fn from THREADS threads at once, and return what each returned or raised
+    """
+    barrier = threading.Barrier(THREADS)
+    outcomes = [None] * THREADS
+
+    def _call(index):
+        barrier.wait()
+        try:
+            outcomes[index] = fn()
+        except Exception as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=_call, args=(index,)) for index in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def test_single_flight():
+    flights = SingleFlight()
+    calls = []
+
+    def _slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return object()
+
+    outcomes = _run_together(lambda: flights.do("key", _slow))
+    assert len(calls) == 1
+    assert all(outcome is outcomes[0] for outcome in outcomes)
+
+    # once done, the next call runs again, and other keys do not wait
+    assert flights.do("key", lambda: 1) == 1
+    assert flights.do("other", lambda: 2) == 2
+
+
+def test_single_flight_error():
+    flights = SingleFlight()
+
+    def _fail():
+        time.sleep(0.2)
+        raise ValueError("boom")
+
+    outcomes = _run_together(lambda: flights.do("key", _fail))
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert flights.do("key", lambda: "recovered") == "recovered"
+
+
+@pytest.fixture
+def single_flight(monkeypatch):
+    monkeypatch.setenv("CBS_CLIENT_SINGLE_FLIGHT", "true")
+
+
+def test_get_config_file(single_flight, monkeypatch, tmp_path):
+    config_file = tmp_path / "application_config.yaml"
+    config_file.write_text("key: ${TEST_ENV}\n")
+    monkeypatch.setenv("CBS_CLIENT_CONFIG_PATH", str(config_file))
+    reads = []
+    read_config_file = client._read_config_file
+
+    def _slow_read(path):
+        reads.append(path)
+        time.sleep(0.2)
+        return read_config_file(path)
+
+    monkeypatch.setattr(client, "_read_config_file", _slow_read)
+    outcomes = _run_together(get_config)
+    assert len(reads) == 1
+    assert outcomes == [{"key": "test_env"}] * THREADS
+
+
+def test_get_config_cbs_error(single_flight, monkeypatch):
+    requests = []
+
+    def _slow_get(session, url, **kwargs):
+        requests.append(url)
+        time.sleep(0.2)
+        return FakeResponse(status_code=404, thejson={})
+
+    monkeypatch.setattr("requests.Session.get", _slow_get)
+    outcomes = _run_together(get_config)
+    assert len(requests) == 1
+    assert all(isinstance(outcome, CantGetConfig) and outcome.code == 404 for outcome in outcomes)
+
+
+def test_off_by_default(monkeypatch):
+    requests = []
+
+    def _get(session, url, **kwargs):
+        requests.append(url)
+        time.sleep(0.05)
+        return FakeResponse(status_code=200, thejson={"key": "value"})
+
+    monkeypatch.setattr("requests.Session.get", _get)
+    assert _run_together(get_config) == [{"key": "value"}] * THREADS
+    assert len(requests) == THREADS
@@ -0,0 +1,93 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+""" unit tests for configuration snapshots """
+import os
+import time
+
+import pytest
+from requests.exceptions import ConnectionError
+
+from onap_dcae_cbs_docker_client import snapshot
+from onap_dcae_cbs_docker_client.client import get_config, clear_cache
+from onap_dcae_cbs_docker_client.exceptions import CBSUnreachable
+
+from conftest import FakeResponse
+
+
+def test_save_and_load(tmp_path):
+    directory = str(tmp_path / "snapshots")
+    assert snapshot.load(directory, "config") is None
+    assert snapshot.save(directory, "config", {"key": ["value", 1]}, '"v1"')
+    assert snapshot.load(directory, "config") == ({"key": ["value", 1]}, '"v1"')
+    assert os.listdir(directory) == ["config.snapshot"]
+
+    path = snapshot.snapshot_path(directory, "config")
+    with open(path, "rb") as fp:
+        data = fp.read()
+    with open(path, "wb") as fp:
+        fp.write(data.replace(b"value", b"VALUE"))
+    assert snapshot.load(directory, "config") is None
+
+
+def test_preload(monkeypatch, tmp_path):
+    calls = []
+    cbs_up = [True]
+
+    def _get(session, url, **kwargs):
+        calls.append(url)
+        if not cbs_up[0]:
+            raise ConnectionError()
+        return FakeResponse(200, {"key": "${TEST_ENV}", "n": len(calls)})
+
+    monkeypatch.setattr("requests.Session.get", _get)
+    monkeypatch.setenv("CBS_CLIENT_SNAPSHOT_DIR", str(tmp_path))
+
+    # every fetch is saved
+    assert get_config() == {"key": "test_env", "n": 1}
+    assert snapshot.load(str(tmp_path), "service_component-testhostname") == ({"key": "${TEST_ENV}", "n": 1}, None)
+
+    # a restarted process with the CBS down still gets the snapshot straight away
+    clear_cache()
+    cbs_up[0] = False
+    monkeypatch.setenv("CBS_CLIENT_SNAPSHOT_PRELOAD", "true")
+    assert get_config() == {"key": "test_env", "n": 1}
+    # ... but only once
+    with pytest.raises(CBSUnreachable):
+        get_config()
+
+    # with the CBS up, the snapshot is refreshed in the background
+    clear_cache()
+    cbs_up[0] = True
+    assert get_config() == {"key": "test_env", "n": 1}
+    deadline = time.monotonic() + 5
+    while snapshot.load(str(tmp_path), "service_component-testhostname")[0]["n"] == 1:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert calls[-1] == "http://config-binding-service:10000/service_component/testhostname"
+    assert get_config()["n"] == len(calls)
+
+
+def test_snapshot_is_last_known_good(monkeypatch, tmp_path):
+    snapshot.save(str(tmp_path), "service_component-testhostname", {"key": "saved"})
+
+    def _get(session, url, **kwargs):
+        raise ConnectionError()
+
+    monkeypatch.setattr("requests.Session.get", _get)
+    monkeypatch.setenv("CBS_CLIENT_SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setenv("CBS_CLIENT_BREAKER_THRESHOLD", "1")
+    assert get_config() == {"key": "saved"}
@@ -0,0 +1,114 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+""" unit tests for get_config_subtree() """
+import json
+import os
+
+import pytest
+
+from onap_dcae_cbs_docker_client import client, jsonscan
+from onap_dcae_cbs_docker_client.client import get_config_subtree
+
+from conftest import FakeResponse
+
+CONFIG = {
+    "collector.service.port": 8080,
+    "streams_publishes": {"ves-fault": {"type": "message_router", "dmaap_info": {"topic_url": "http://${TEST_ENV}/events/FAULT"}}},
+    "rules": [{"name": "rule-{0}".format(n)} for n in range(100)],
+    "nothing": None,
+}
+
+
+@pytest.fixture
+def config_file(monkeypatch, tmp_path):
+    path = tmp_path / "application_config.json"
+    path.write_text(json.dumps(CONFIG))
+    monkeypatch.setenv("CBS_CLIENT_CONFIG_PATH", str(path))
+    return path
+
+
+def _count(monkeypatch, module, name):
+    calls = []
+    fn = getattr(module, name)
+
+    def _counted(*args, **kwargs):
+        calls.append(args)
+        return fn(*args, **kwargs)
+
+    monkeypatch.setattr(module, name, _counted)
+    return calls
+
+
+def _touch(path, text):
+    path.write_text(text)
+    stat = os.stat(str(path))
+    os.utime(str(path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+
+
+def test_json_partial_parse(config_file, monkeypatch):
+    monkeypatch.setenv("CBS_CLIENT_JSON_FAST_PATH", "true")
+    parses = _count(monkeypatch, client, "_parse_config")
+    finds = _count(monkeypatch, jsonscan, "get")
+
+    expected = {"type": "message_router", "dmaap_info": {"topic_url": "http://test_env/events/FAULT"}}
+    assert get_config_subtree("streams_publishes") == {"ves-fault": expected}
+    assert get_config_subtree(("streams_publishes", "ves-fault")) == expected
+    assert get_config_subtree("collector.service.port") == 8080
+    assert get_config_subtree("nothing") is None
+    assert parses == []
+    assert len(finds) == 4
+
+    # memoized until the file changes
+    get_config_subtree("streams_publishes")
+    assert len(finds) == 4
+    _touch(config_file, json.dumps(dict(CONFIG, **{"collector.service.port": 8081})))
+    assert get_config_subtree("collector.service.port") == 8081
+    assert len(finds) == 5
+
+
+def test_yaml_parsed_once_per_version(config_file, monkeypatch):
+    config_file.write_text("streams_publishes:\n  a: ${TEST_ENV}\nother:\n  b: [1, 2]\n")
+    parses = _count(monkeypatch, client, "_parse_config")
+    assert get_config_subtree("streams_publishes") == {"a": "test_env"}
+    assert get_config_subtree(["other", "b"]) == [1, 2]
+    assert len(parses) == 1
+
+    _touch(config_file, "streams_publishes:\n  a: changed\n")
+    assert get_config_subtree("streams_publishes") == {"a": "changed"}
+    assert len(parses) == 2
+
+
+def test_missing_subtree(config_file):
+    with pytest.raises(KeyError):
+        get_config_subtree("streams_subscribes")
+    with pytest.raises(KeyError):
+        get_config_subtree(("collector.service.port", "x"))
+
+
+def test_env_expanded_each_call(config_file, monkeypatch):
+    monkeypatch.setenv("TEST_ENV", "first")
+    assert get_config_subtree(("streams_publishes", "ves-fault", "dmaap_info", "topic_url")) == "http://first/events/FAULT"
+    monkeypatch.setenv("TEST_ENV", "second")
+    assert get_config_subtree(("streams_publishes", "ves-fault", "dmaap_info", "topic_url")) == "http://second/events/FAULT"
+
+
+def test_cbs_fallback(monkeypatch, tmp_path):
+    monkeypatch.setenv("CBS_CLIENT_CONFIG_PATH", str(tmp_path / "missing.yaml"))
+    monkeypatch.setattr("requests.Session.get", lambda session, url, **kwargs: FakeResponse(200, CONFIG))
+    assert get_config_subtree(("streams_publishes", "ves-fault", "type")) == "message_router"
+    with pytest.raises(KeyError):
+        get_config_subtree("missing")
@@ -0,0 +1,101 @@
+# ================================================================================
+# Copyright (c) 2026 AT&T Intellectual Property. All rights reserved.
+# ================================================================================
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============LICENSE_END=========================================================
+
+""" unit tests for the config watcher """
+
+import os
+import queue
+
+import pytest
+
+from onap_dcae_cbs_docker_client.diff import config_diff
+from onap_dcae_cbs_docker_client.watcher import ConfigWatcher
+
+
+def _configmap(tmp_path, version, files):
+    """
+    lay the files out the way Kubernetes mounts a ConfigMap, or swap in a new version
+    """
+    data_dir = tmp_path / "..{0}".format(version)
+    data_dir.mkdir()
+    for name, text in files.items():
+        (data_dir / name).write_text(text)
+    tmp_link = tmp_path / "..data_tmp"
+    os.symlink(data_dir.name, str(tmp_link))
+    os.replace(str(tmp_link), str(tmp_path / "..data"))
+    for name in files:
+        link = tmp_path / name
+        if not os.path.lexists(str(link)):
+            os.symlink(os.path.join("..data", name), str(link))
+
+
+def test_config_diff():
+    old = {"a": 1, "b": {"c": [1, 2, 3]}, "d": "x"}
+    new = {"a": 1, "b": {"c": [1, 5]}, "e": "y"}
+    diff = config_diff(old, new)
+    assert diff.added == {("e",): "y"}
+    assert diff.removed == {("d",): "x", ("b", "c", 2): 3}
+    assert diff.changed == {("b", "c", 1): (2, 5)}
+    assert diff
+    assert not config_diff(old, {"a": 1, "b": {"c": [1, 2, 3]}, "d": "x"})
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher_configmap_swap(tmp_path, use_inotify):
+    _configmap(tmp_path, "v1", {"application_config.yaml": "key: ${TEST_ENV}\nother: 1\n"})
+    changes = queue.Queue()
+    watcher = ConfigWatcher(config_path=str(tmp_path / "application_config.yaml"),
+                            interval=0.05, use_inotify=use_inotify)
+    watcher.add_callback(lambda config, diff: changes.put((config, diff)))
+    watcher.start()
+    try:
+        assert watcher.config == {"key": "test_env", "other": 1}
+
+        _configmap(tmp_path, "v2", {"application_config.yaml": "key: ${TEST_ENV}\nother: 2\n"})
+        config, diff = changes.get(timeout=5)
+        assert config == {"key": "test_env", "other": 2}
+        assert diff.changed == {("other",): (1, 2)}
+        assert watcher.config is config
+
+        # same content in a new version: nothing to report
+        _configmap(tmp_path, "v3", {"application_config.yaml": "key: ${TEST_ENV}\nother: 2\n"})
+        assert watcher.check() is False
+        with pytest.raises(queue.Empty):
+            changes.get(timeout=0.3)
+    finally:
+        watcher.stop()
+
+
+def test_watcher_policies(tmp_path):
+    config_file = tmp_path / "application_config.yaml"
+    policy_file = tmp_path / "policies.json"
+    config_file.write_text("key: value\n")
+    policy_file.write_text('{"policies": {"items": []}}')
+    changes = []
+    watcher = ConfigWatcher(config_path=str(config_file), policy_path=str(policy_file),
+                            include_policies=True, use_inotify=False)
+    watcher.add_callback(lambda config, diff: changes.append(diff))
+    watcher.check(notify=False)
+    assert watcher.config == {"config": {"key": "value"}, "policies": {"items": []}}
+
+    policy_file.write_text('{"policies": {"items": [{"policy_id": "p1"}]}}')
+    assert watcher.check() is True
+    assert changes[0].added == {("policies", "items", 0): {"policy_id": "p1"}}
+
+    # a broken file keeps the last good configuration
+    config_file.write_text("key: [\n")
+    assert watcher.check() is False
+    assert watcher.config["config"] == {"key": "value"}